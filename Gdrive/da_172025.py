@@ -1,19 +1,10 @@
-from googleapiclient.discovery import build
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.errors import HttpError
-from google.auth.transport.requests import Request
-from googleapiclient.http import MediaIoBaseDownload
-import boto3
-import zipfile
-import traceback
-import json
-import csv
-import pickle
+import sys
 import typer
 import os
-import io
-from concurrent.futures import ThreadPoolExecutor,as_completed
-from rich.progress import Progress
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from drivekit.auth import get_credential_manager
+from drivekit.listing import list_files
 
 
 scope=['https://www.googleapis.com/auth/drive']
@@ -44,63 +35,16 @@ class Main:
     #                 pickle.dump(creds,token)
     #     return creds
     def run(self):
-        authn=self.auth()
-        aut=self.authentication()
-        service=build('drive','v3',credentials=aut)
-        list1=self.processing(service)
-        print(authn)
-        print(aut)
+        creds=self.auth()
+        list1=self.processing()
+        print(creds)
         print(list1)
     def auth(self):
-        creds=None
-        if os.path.exists('token.pickle'):
-            with open('token.pickle','rb') as token:
-                creds=pickle.load(token)
-        if not creds or not creds.valid:
-            if creds and creds.refresh_token and creds.expired:
-                creds.refresh(Request())
-            else:
-                flow=InstalledAppFlow.from_client_secrets_file('credentials.json',scope)
-                creds=flow.run_local_server(port=0)
-                with open('token.pickle','wb') as token:
-                    pickle.dump(creds,token)
-        return creds
-    def authentication(self):
-        creds=None
-        if os.path.exists('token.pickle'):
-            with open('token.pickle','rb') as token:
-                creds=pickle.load(token)
-        if not creds or not creds.valid:
-            if creds and creds.refresh_token and creds.expired:
-                creds.refresh(Request())
-            else:
-                flow=InstalledAppFlow.from_client_secrets_file('credentials.json',scope)
-                creds=flow.run_local_server(port=0)
-                with open('token.pickle','wb') as token:
-                    pickle.dump(creds,token)
-        return creds
-    def processing(self,service):
-        files=[]
-        page_token=None
-        while True:
-            resp=service.files().list(
-                q=f"'{self.folder_id}' in parents and trashed=false",
-                spaces='drive',
-                fields='nextPageToken,files(id,name,size)',
-                includeItemsFromAllDrives=True,
-                supportsAllDrives=True,
-                pageToken=page_token
-            ).execute()
-
-            for f in resp.get('files', []):
-                if f.get('mimeType') == 'application/vnd.google-apps.folder':
-                    files.extend(self.processing(service, f['id']))
-                else:
-                    files.append(f)
-            page_token = resp.get('nextPageToken')
-            if not page_token:
-                break
-        return files
+        # token.pickle is loaded once per process and shared by every thread
+        return get_credential_manager('token.pickle','credentials.json',scope).get()
+    def processing(self):
+        # recursive, concurrent listing shared with the other Drive scripts
+        return list_files(get_credential_manager('token.pickle','credentials.json',scope),self.folder_id)
     
 
 app=typer.Typer()
@@ -22,57 +22,51 @@
 #     print(f"{f['name']} ({f['id']})")
 
 
-from googleapiclient.discovery import build
-from google_auth_oauthlib.flow import InstalledAppFlow
-import csv
+import os
+import sys
+
+import typer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from drivekit.auth import get_credential_manager
 
 # 1️⃣ Authentication
 SCOPES = ['https://www.googleapis.com/auth/drive.metadata.readonly']
-flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
-creds = flow.run_local_server(port=0)
-
-service = build('drive', 'v3', credentials=creds)
-
-# 2️⃣ Your Folder ID
-folder_id = "1XxMoo2sNnKlAOkJrVRndSf9-W9KBxc4i"
-
-# 3️⃣ Pagination Loop
-all_files = []
-page_token = None
-
-print("Fetching files... please wait...")
-
-while True:
-    response = service.files().list(
-        q=f"'{folder_id}' in parents and trashed=false",
-        fields="nextPageToken, files(id, name, mimeType, size)",
-        pageSize=1000,  # max per page
-        pageToken=page_token
-    ).execute()
-    
-    all_files.extend(response.get('files', []))
-    page_token = response.get('nextPageToken', None)
-    
-    if not page_token:
-        break  # no more pages
-
-# 4️⃣ Display Summary
-print(f"\n✅ Total files found: {len(all_files)}")
-
-# Calculate total size (optional)
-total_size = sum(int(f.get('size', 0)) for f in all_files if 'size' in f)
-print(f"📦 Total size: {total_size / (1024 * 1024):.2f} MB")
-
-# 5️⃣ Save results to CSV (optional)
-with open("drive_folder.csv", "w", newline="", encoding="utf-8") as csvfile:
-    writer = csv.writer(csvfile)
-    writer.writerow(["Name", "ID", "MIME Type", "Size (bytes)"])
-    for f in all_files:
-        writer.writerow([
-            f.get("name", ""),
-            f.get("id", ""),
-            f.get("mimeType", ""),
-            f.get("size", "")
-        ])
-
-print("\n💾 File list saved as: drive_folder_files.csv")
+
+app = typer.Typer()
+
+
+@app.command()
+def main(folder_id: str = typer.Argument("1XxMoo2sNnKlAOkJrVRndSf9-W9KBxc4i"),
+         output: str = typer.Argument("drive_folder.csv"),
+         files_output: str = typer.Option("drive_folder_files.csv",
+                                          help="Per-file listing: .csv, or .parquet for a Parquet dataset")):
+    """
+    Size a Drive folder du-style: the whole subtree is crawled concurrently
+    and every folder (the A0000xx subfolders included) gets its own file
+    count and byte total in the CSV. The file listing is streamed to
+    files_output page by page during the same crawl, so a run that dies
+    part-way keeps what it had listed.
+    """
+    from drivekit.export import ListingWriter
+    from drivekit.listing import FILE_FIELDS, folder_totals, write_folder_totals
+
+    auth = get_credential_manager('token.pickle', 'credentials.json', SCOPES)
+
+    print("Fetching files... please wait...")
+    with ListingWriter(files_output) as listing:
+        totals = folder_totals(auth, folder_id, fields=FILE_FIELDS, on_item=listing.write)
+
+    # 4️⃣ Display Summary
+    total = totals[folder_id]
+    print(f"\n✅ Total files found: {total['files']} in {len(totals) - 1} folders")
+    print(f"📦 Total size: {total['bytes'] / (1024 * 1024):.2f} MB")
+
+    # 5️⃣ Save per-folder totals to CSV
+    write_folder_totals(totals, output)
+    print(f"\n💾 Folder totals saved as: {output}")
+    print(f"💾 File list saved as: {files_output}")
+
+
+if __name__ == "__main__":
+    app()
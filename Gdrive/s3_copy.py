@@ -0,0 +1,18 @@
+# s3_copy.py
+# Runs 1.txt / oct22.txt / oct23.txt / oct24.txt style manifests with boto3
+# instead of one `aws s3 cp` process per line:
+#   python Gdrive/s3_copy.py Gdrive/oct24.txt --workers 64
+import os
+import sys
+
+import typer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from drivekit.cli import s3_copy_cmd
+
+app = typer.Typer()
+app.command()(s3_copy_cmd)
+
+
+if __name__ == '__main__':
+    app()
@@ -0,0 +1 @@
+"""Shared Google Drive helpers used by the scripts in extarct_doc/, Gdrive/ and video_to_wav/."""
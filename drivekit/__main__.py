@@ -0,0 +1,3 @@
+from drivekit.cli import app
+
+app()
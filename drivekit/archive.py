@@ -0,0 +1,145 @@
+# archive.py
+import os
+import json
+import zipfile
+
+from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeRemainingColumn
+
+from drivekit.download import MAX_WORKERS, download_files, safe_name
+from drivekit.listing import list_files
+from drivekit.shards import SHARD_SIZE, ShardWriter, sample_key
+from drivekit.verify import md5_manifest_path
+
+# formats that are already compressed; deflating them again only burns CPU
+STORED_EXTS = {
+    '.zip', '.gz', '.bz2', '.xz', '.7z', '.rar',
+    '.jpg', '.jpeg', '.png', '.gif', '.webp',
+    '.mp3', '.m4a', '.aac', '.ogg', '.opus', '.flac',
+    '.mp4', '.mov', '.mkv', '.avi', '.webm',
+    '.docx', '.xlsx', '.pptx', '.pdf',
+}
+
+
+class ZipArchiveWriter:
+    """
+    Append downloaded files to a ZIP with unique flat member names.
+    Already-compressed formats are stored, everything else is deflated.
+    The Drive md5 of each member goes to <zip>.md5.json on close.
+    """
+
+    def __init__(self, zip_name, compresslevel=6):
+        self.zip_name = zip_name
+        self.zf = zipfile.ZipFile(zip_name, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
+        self.seen = {}
+        self.md5s = {}
+
+    def arcname(self, name):
+        base = safe_name(name)
+        count = self.seen.get(base, 0)
+        self.seen[base] = count + 1
+        if count > 0:
+            name_root, ext = os.path.splitext(base)
+            return f"{name_root}_{count}{ext}"
+        return base
+
+    def add(self, path, name, md5=None):
+        arcname = self.arcname(name)
+        ext = os.path.splitext(arcname)[1].lower()
+        compress = zipfile.ZIP_STORED if ext in STORED_EXTS else zipfile.ZIP_DEFLATED
+        self.zf.write(path, arcname=arcname, compress_type=compress)
+        if md5:
+            self.md5s[arcname] = md5
+        return arcname
+
+    def close(self):
+        self.zf.close()
+        with open(md5_manifest_path(self.zip_name), 'w', encoding='utf-8') as fh:
+            json.dump(self.md5s, fh, indent=1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def download_and_zip_folder(auth, folder_id, zip_name='drive_folder.zip', max_workers=MAX_WORKERS):
+    """
+    Download every file below folder_id and pack it into zip_name.
+    Files are added as soon as their download finishes, so zipping overlaps
+    with the downloads still in flight and temp files never pile up.
+    """
+    print("[+] Listing files (this may take a while for large folders)...")
+    all_files = list_files(auth, folder_id)
+    total_files = len(all_files)
+    print(f"[+] Found {total_files} files. Using {max_workers} workers.\n")
+
+    if total_files == 0:
+        print("[-] No files found - exiting.")
+        return [], []
+
+    failed = []
+    with ZipArchiveWriter(zip_name) as writer, \
+            Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), BarColumn(), TimeRemainingColumn()) as progress:
+        task = progress.add_task("Downloading...", total=total_files)
+        for res in download_files(all_files, auth, max_workers=max_workers):
+            if not res['success']:
+                failed.append(res)
+                progress.console.print(f"[!] Failed: {res['name']} -> {res['error']}")
+            else:
+                try:
+                    writer.add(res['path'], res['name'], res['md5'])
+                except Exception as e:
+                    print(f"[!] Error writing {res['path']} to zip: {e}")
+                    failed.append({'id': res['id'], 'name': res['name'], 'error': str(e)})
+                finally:
+                    try:
+                        os.remove(res['path'])
+                    except Exception:
+                        pass
+            progress.advance(task)
+
+    print(f"✅ Done. ZIP created: {zip_name}")
+    if failed:
+        print(f"[!] {len(failed)} files failed.")
+        for f in failed:
+            print(f"    - {f['name']}: {f['error']}")
+    return all_files, failed
+
+
+def download_to_shards(auth, folder_id, out_dir, max_size=SHARD_SIZE, max_workers=MAX_WORKERS):
+    """
+    Download every file below folder_id into WebDataset-style tar shards,
+    each file stored as <key>.<ext> next to a <key>.json with its Drive metadata.
+    """
+    print("[+] Listing files...")
+    all_files = list_files(auth, folder_id)
+    print(f"[+] Found {len(all_files)} files. Using {max_workers} workers.")
+    metas = {f['id']: f for f in all_files}
+
+    failed = []
+    with ShardWriter(out_dir, max_size=max_size) as writer, Progress() as progress:
+        task = progress.add_task("Downloading...", total=len(all_files))
+        for res in download_files(all_files, auth, max_workers=max_workers):
+            if not res['success']:
+                failed.append(res)
+                progress.console.print(f"[!] Failed: {res['name']} -> {res['error']}")
+            else:
+                meta = metas[res['id']]
+                key = sample_key(os.path.join(meta.get('path', ''), res['name']).replace(os.path.sep, '__'))
+                ext = os.path.splitext(res['name'])[1].lstrip('.').lower() or 'bin'
+                info = {k: meta.get(k) for k in ('id', 'name', 'mimeType', 'modifiedTime', 'md5Checksum', 'size', 'path')}
+                try:
+                    writer.write(key, {ext: res['path']}, info)
+                except Exception as e:
+                    progress.console.print(f"[!] Error writing {res['name']} to shards: {e}")
+                    failed.append({'id': res['id'], 'name': res['name'], 'error': str(e)})
+                finally:
+                    try:
+                        os.remove(res['path'])
+                    except Exception:
+                        pass
+            progress.advance(task)
+
+    print(f"✅ Done. {len(writer.shards)} shards in {out_dir}")
+    return all_files, failed
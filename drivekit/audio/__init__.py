@@ -0,0 +1 @@
+"""Audio extraction and post-processing used by video_to_wav."""
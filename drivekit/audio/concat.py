@@ -0,0 +1,136 @@
+# concat.py
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from rich.progress import Progress
+
+from drivekit.audio.wav import WavFormatError, parse_header, wav_header
+
+SEGMENT_PATTERN = r'^(?P<session>.+)_(?P<index>\d+)\.wav$'   # A000672_t1_12.wav
+CONCAT_WORKERS = 8
+COPY_SIZE = 8 * 1024 * 1024
+MAX_DATA = 0xFFFFFFFF - 36   # RIFF sizes are 32-bit
+
+
+def group_sessions(paths, pattern=SEGMENT_PATTERN):
+    """
+    {(directory, session): [segment paths in numeric order]}.
+    Files that do not match pattern are ignored.
+    """
+    regex = re.compile(pattern, re.IGNORECASE)
+    sessions = {}
+    for path in paths:
+        m = regex.match(os.path.basename(path))
+        if m:
+            key = (os.path.dirname(path), m.group('session'))
+            sessions.setdefault(key, []).append((int(m.group('index')), path))
+    return {key: [p for _, p in sorted(segs)] for key, segs in sessions.items()}
+
+
+def find_sessions(src_dir, pattern=SEGMENT_PATTERN):
+    """Walk src_dir and group every segment WAV below it by session."""
+    paths = [os.path.join(root, name) for root, _, names in os.walk(src_dir) for name in names]
+    return group_sessions(paths, pattern)
+
+
+def _copy_range(src, dst, offset, size):
+    """Append size bytes of src, starting at offset, to dst; in the kernel where possible."""
+    done = 0
+    if hasattr(os, 'copy_file_range'):
+        dst.flush()
+        pos = dst.tell()
+        try:
+            while done < size:
+                n = os.copy_file_range(src.fileno(), dst.fileno(), min(COPY_SIZE, size - done),
+                                       offset + done, pos + done)
+                if not n:
+                    break
+                done += n
+        except OSError:
+            pass   # e.g. cross-filesystem on older kernels; read/write the rest
+        dst.seek(pos + done)
+    src.seek(offset + done)
+    while done < size:
+        chunk = src.read(min(COPY_SIZE, size - done))
+        if not chunk:
+            break
+        dst.write(chunk)
+        done += len(chunk)
+    return done
+
+
+def concat_wavs(paths, dst):
+    """
+    Join WAV segments (same rate/channels/sample format) into dst by copying
+    their data chunks back to back. Memory use is one copy buffer however
+    long the session is; the header is written once more at the end with
+    the real sizes. Returns {'output', 'segments', 'frames', 'duration'}.
+    """
+    fmt = None
+    data_size = 0
+    tmp = dst + '.part'
+    try:
+        with open(tmp, 'wb') as out:
+            out.write(b'\0' * 44)   # header placeholder
+            for path in paths:
+                with open(path, 'rb') as fh:
+                    parsed = parse_header(fh.read(64 * 1024))
+                    if parsed is None:
+                        raise WavFormatError(f"{path}: no data chunk in the first 64 KiB")
+                    seg_fmt, offset, size = parsed
+                    if size in (0, 0xFFFFFFFF) or offset + size > os.fstat(fh.fileno()).st_size:
+                        size = os.fstat(fh.fileno()).st_size - offset
+                    size -= size % seg_fmt['block_align']
+                    if fmt is None:
+                        fmt = seg_fmt
+                    elif seg_fmt != fmt:
+                        raise WavFormatError(f"{path}: format {seg_fmt} differs from {fmt}")
+                    if data_size + size > MAX_DATA:
+                        raise WavFormatError(f"{dst}: session exceeds the 4 GiB WAV limit")
+                    data_size += _copy_range(fh, out, offset, size)
+            if fmt is None:
+                raise WavFormatError(f"{dst}: no segments")
+            if data_size & 1:
+                out.write(b'\0')
+            out.seek(0)
+            out.write(wav_header(fmt, data_size))
+        os.replace(tmp, dst)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    frames = data_size // fmt['block_align']
+    return {'output': dst, 'segments': len(paths), 'frames': frames,
+            'duration': round(frames / fmt['sample_rate'], 3)}
+
+
+def concat_sessions(src_dir, out_dir, pattern=SEGMENT_PATTERN, max_workers=CONCAT_WORKERS):
+    """
+    Concatenate every session found below src_dir into out_dir/<relative dir>/<session>.wav,
+    sessions in parallel. Returns one result dict per session with
+    'session', 'success' and 'error' added.
+    """
+    sessions = find_sessions(src_dir, pattern)
+    results = []
+
+    def job(key, paths):
+        directory, session = key
+        target_dir = os.path.join(out_dir, os.path.relpath(directory, src_dir))
+        os.makedirs(target_dir, exist_ok=True)
+        return concat_wavs(paths, os.path.join(target_dir, f"{session}.wav"))
+
+    with Progress() as progress:
+        task = progress.add_task("[cyan]Concatenating...", total=len(sessions))
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            futures = {ex.submit(job, key, paths): key for key, paths in sessions.items()}
+            for fut in as_completed(futures):
+                session = futures[fut][1]
+                try:
+                    res = dict(fut.result(), session=session, success=True, error=None)
+                except Exception as e:
+                    res = {'session': session, 'output': None, 'success': False, 'error': str(e)}
+                    progress.console.print(f"[!] Failed: {session} -> {e}")
+                results.append(res)
+                progress.advance(task)
+    return results
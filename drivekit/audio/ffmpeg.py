@@ -0,0 +1,229 @@
+# ffmpeg.py
+import os
+import shutil
+import threading
+import subprocess
+
+THREADS_PER_JOB = 1   # ffmpeg -threads per conversion; jobs run side by side
+READ_SIZE = 1024 * 1024
+
+# output codec -> (ffmpeg encoder, file extension, encoder options)
+CODECS = {
+    'wav': ('pcm_s16le', '.wav', []),
+    'flac': ('flac', '.flac', ['-compression_level', '5']),
+    'opus': ('libopus', '.opus', ['-b:a', '48k', '-application', 'audio']),
+}
+
+
+# stderr of an input ffmpeg could only read from a seekable file (moov atom at the end)
+PIPE_ERRORS = ('partial file', 'moov atom not found', 'Invalid data found when processing input')
+
+
+class FfmpegError(RuntimeError):
+    """ffmpeg exited non-zero (bad input, unsupported or unseekable container...); stderr has its log."""
+
+    def __init__(self, message, stderr=''):
+        super().__init__(message)
+        self.stderr = stderr
+
+    @property
+    def needs_seekable_input(self):
+        """True when the input failed only because it came through a pipe."""
+        return any(marker in self.stderr for marker in PIPE_ERRORS)
+
+
+def ffmpeg_binary():
+    """ffmpeg from $FFMPEG_BINARY, the PATH, or the copy bundled with imageio-ffmpeg (moviepy's)."""
+    binary = os.environ.get('FFMPEG_BINARY') or shutil.which('ffmpeg')
+    if binary:
+        return binary
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except ImportError:
+        raise RuntimeError("ffmpeg not found; install it or set FFMPEG_BINARY")
+
+
+def default_jobs(threads_per_job=THREADS_PER_JOB):
+    """Concurrent ffmpeg processes that keep every core busy."""
+    return max(1, (os.cpu_count() or 4) // max(1, threads_per_job))
+
+
+def audio_command(src, dst, codec='pcm_s16le', sample_rate=None, channels=None,
+                  threads=THREADS_PER_JOB, fmt=None, options=()):
+    """
+    ffmpeg argv that extracts the first audio stream of src into dst.
+    Video, subtitle and data streams are never decoded (-vn -sn -dn), and
+    -xerror makes truncated or unreadable input a non-zero exit instead of
+    an empty WAV.
+    codec='copy' keeps the source audio as-is when the container allows it.
+    src/dst may be 'pipe:0'/'pipe:1' for streaming.
+    """
+    cmd = [ffmpeg_binary(), '-nostdin', '-hide_banner', '-loglevel', 'error', '-xerror', '-y',
+           '-threads', str(threads), '-i', src,
+           '-vn', '-sn', '-dn', '-map', '0:a:0', '-c:a', codec]
+    if codec != 'copy':
+        if sample_rate:
+            cmd += ['-ar', str(sample_rate)]
+        if channels:
+            cmd += ['-ac', str(channels)]
+    cmd += list(options)
+    if fmt:
+        cmd += ['-f', fmt]
+    cmd.append(dst)
+    return cmd
+
+
+def extract_audio(src, dst, codec='pcm_s16le', sample_rate=None, channels=None,
+                  threads=THREADS_PER_JOB, timeout=None, stats=False):
+    """
+    Run ffmpeg once and raise FfmpegError with its stderr on failure.
+    With stats=True the WAV comes back over stdout and is written by
+    WavStreamWriter, which measures it on the way; its stats are returned.
+    """
+    if not stats:
+        cmd = audio_command(src, dst, codec, sample_rate, channels, threads)
+        proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout)
+        if proc.returncode != 0:
+            raise _error(proc.returncode, proc.stderr)
+        return dst
+
+    cmd = audio_command(src, 'pipe:1', codec, sample_rate, channels, threads, fmt='wav')
+    proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stderr = []
+    reader = threading.Thread(target=lambda: stderr.append(proc.stderr.read()), daemon=True)
+    reader.start()
+    pump = _WavPump(proc.stdout, dst)
+    pump.run()
+    returncode = proc.wait(timeout=timeout)
+    reader.join()
+    if returncode != 0 or pump.error:
+        if os.path.exists(dst):
+            os.remove(dst)
+        raise _error(returncode, b''.join(stderr)) if returncode else FfmpegError(str(pump.error))
+    return pump.stats
+
+
+def encode_audio(src, codec, threads=THREADS_PER_JOB, timeout=None):
+    """
+    Re-encode a WAV as one of CODECS next to it (same stem) and delete the
+    WAV. Returns the new path. FLAC is lossless; Opus is meant for previews.
+    """
+    encoder, ext, options = CODECS[codec]
+    dst = os.path.splitext(src)[0] + ext
+    cmd = audio_command(src, dst, encoder, threads=threads, options=options)
+    proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout)
+    if proc.returncode != 0:
+        if os.path.exists(dst):
+            os.remove(dst)
+        raise _error(proc.returncode, proc.stderr)
+    os.remove(src)
+    return dst
+
+
+class _WavPump:
+    """Copy ffmpeg's WAV stdout to disk through WavStreamWriter."""
+
+    def __init__(self, stream, dst):
+        self.stream = stream
+        self.dst = dst
+        self.stats = None
+        self.error = None
+
+    def run(self):
+        from drivekit.audio.wav import WavStreamWriter
+
+        try:
+            writer = WavStreamWriter(self.dst)
+            for chunk in iter(lambda: self.stream.read(READ_SIZE), b''):
+                writer.write(chunk)
+            self.stats = writer.close()
+        except Exception as e:
+            self.error = e
+            # keep draining so ffmpeg never blocks on a full pipe
+            for _ in iter(lambda: self.stream.read(READ_SIZE), b''):
+                pass
+
+
+def _error(returncode, stderr):
+    text = (stderr or b'').decode('utf-8', 'replace').strip()
+    lines = text.splitlines()
+    return FfmpegError(f"ffmpeg exited {returncode}: {lines[-1] if lines else ''}", text)
+
+
+class FfmpegSink:
+    """
+    Writable binary file object that pipes everything written to it into an
+    ffmpeg process decoding to dst, so a download can be converted while it
+    is still arriving and the source never touches the disk.
+
+    Note: MP4/MOV files whose index (moov atom) sits at the end cannot be
+    decoded from a pipe; ffmpeg then fails with FfmpegError.
+    """
+
+    def __init__(self, dst, codec='pcm_s16le', sample_rate=None, channels=None,
+                 threads=THREADS_PER_JOB, fmt=None, stats=False):
+        self.dst = dst
+        self.stats = None
+        self._pump = None
+        if stats:
+            # WAV comes back on stdout and is measured while it is written
+            cmd = audio_command('pipe:0', 'pipe:1', codec, sample_rate, channels, threads, fmt='wav')
+        else:
+            cmd = audio_command('pipe:0', dst, codec, sample_rate, channels, threads, fmt)
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE if stats else subprocess.DEVNULL,
+                                     stderr=subprocess.PIPE)
+        if stats:
+            self._pump = _WavPump(self.proc.stdout, dst)
+            self._pump_thread = threading.Thread(target=self._pump.run, daemon=True)
+            self._pump_thread.start()
+        # drain stderr so a chatty ffmpeg can never block on a full pipe
+        self._stderr = []
+        self._reader = threading.Thread(target=lambda: self._stderr.append(self.proc.stderr.read()), daemon=True)
+        self._reader.start()
+
+    def _fail(self):
+        returncode = self.proc.wait()
+        self._reader.join()
+        if self._pump:
+            self._pump_thread.join()
+        return _error(returncode, b''.join(self._stderr))
+
+    def write(self, data):
+        try:
+            self.proc.stdin.write(data)
+        except (BrokenPipeError, ValueError):
+            # ffmpeg gave up on the input early
+            raise self._fail()
+        return len(data)
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        if self.proc.wait() != 0:
+            raise self._fail()
+        self._reader.join()
+        if self._pump:
+            self._pump_thread.join()
+            if self._pump.error:
+                raise FfmpegError(str(self._pump.error))
+            self.stats = self._pump.stats
+
+    def abort(self):
+        self.proc.kill()
+        self.proc.wait()
+        self._reader.join()
+        if self._pump:
+            self._pump_thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
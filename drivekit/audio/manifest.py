@@ -0,0 +1,48 @@
+# manifest.py
+import os
+import csv
+import threading
+
+COLUMNS = ['file_id', 'name', 'output', 'start', 'end', 'duration', 'sample_rate', 'channels',
+           'bits', 'frames', 'peak_dbfs', 'rms_dbfs', 'bytes']
+
+
+class AudioManifest:
+    """
+    Append-only CSV with one row of audio stats per converted file. Rows are
+    flushed as they arrive, so a crashed run keeps what it measured; a
+    re-run appends to the same file, keeping that file's columns.
+    """
+
+    def __init__(self, path, columns=COLUMNS):
+        self.path = path
+        self.columns = columns
+        self._lock = threading.Lock()
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new:
+            with open(path, newline='', encoding='utf-8') as fh:
+                columns = next(csv.reader(fh))
+        self.fh = open(path, 'a', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.fh, fieldnames=columns, extrasaction='ignore')
+        if new:
+            self.writer.writeheader()
+
+    def add(self, row):
+        with self._lock:
+            self.writer.writerow(row)
+            self.fh.flush()
+
+    def close(self):
+        self.fh.close()
+
+
+def csv_to_parquet(csv_path, parquet_path=None):
+    """Convert a manifest CSV to Parquet (needs pyarrow)."""
+    try:
+        import pyarrow.csv as pv
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet output needs pyarrow: pip install pyarrow")
+    parquet_path = parquet_path or os.path.splitext(csv_path)[0] + '.parquet'
+    pq.write_table(pv.read_csv(csv_path), parquet_path)
+    return parquet_path
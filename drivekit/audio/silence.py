@@ -0,0 +1,161 @@
+# silence.py
+import os
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from drivekit.audio.wav import (PcmStats, WavFormatError, decode_frames, parse_header,
+                                sample_dtype, wav_header)
+
+THRESHOLD_DB = -40.0    # frames quieter than this (dBFS RMS) count as silence
+FRAME_MS = 30           # analysis frame; hop is half of it
+MIN_SILENCE_MS = 500    # shorter pauses stay inside a segment
+PAD_MS = 150            # kept around every segment so words are not clipped
+READ_FRAMES = 1 << 18   # audio frames per read (~5 s at 48 kHz)
+
+
+def frame_energy_db(x, frame, hop):
+    """RMS level in dBFS of every frame-long window of x, hop samples apart (strided view, no copy)."""
+    windows = sliding_window_view(x, frame)[::hop]
+    rms = np.sqrt(np.einsum('ij,ij->i', windows, windows) / frame)
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+class SilenceDetector:
+    """
+    Energy-based speech/silence detection over a stream of mono samples.
+    feed() takes blocks of any size; only the partial frame at the end of a
+    block is carried over, so memory does not grow with the file.
+    finish() returns the (start, end) sample offsets of the non-silent parts.
+    """
+
+    def __init__(self, sample_rate, threshold_db=THRESHOLD_DB, frame_ms=FRAME_MS,
+                 min_silence_ms=MIN_SILENCE_MS, pad_ms=PAD_MS):
+        self.frame = max(2, sample_rate * frame_ms // 1000)
+        self.hop = self.frame // 2
+        self.threshold = threshold_db
+        self.gap = max(1, sample_rate * min_silence_ms // 1000 // self.hop)
+        self.pad = sample_rate * pad_ms // 1000
+        self.carry = np.zeros(0, dtype=np.float32)
+        self.base = 0       # index of the next analysis frame
+        self.samples = 0
+        self.start = None   # first voiced frame of the open run
+        self.last = None    # last voiced frame seen
+        self.runs = []
+
+    def _mark(self, voiced):
+        if not voiced.size:
+            return
+        if self.start is None:
+            self.start = voiced[0]
+        elif voiced[0] - self.last > self.gap:
+            self.runs.append((self.start, self.last))
+            self.start = voiced[0]
+        for b in np.flatnonzero(np.diff(voiced) > self.gap):
+            self.runs.append((self.start, voiced[b]))
+            self.start = voiced[b + 1]
+        self.last = voiced[-1]
+
+    def feed(self, x):
+        self.samples += len(x)
+        buf = np.concatenate((self.carry, x)) if self.carry.size else x
+        if len(buf) < self.frame:
+            self.carry = buf
+            return
+        db = frame_energy_db(buf, self.frame, self.hop)
+        self._mark(np.flatnonzero(db > self.threshold) + self.base)
+        self.base += len(db)
+        self.carry = buf[len(db) * self.hop:].copy()
+
+    def finish(self):
+        if self.carry.size and frame_energy_db(self.carry, len(self.carry), 1)[0] > self.threshold:
+            self._mark(np.array([self.base]))
+        runs = self.runs + ([(self.start, self.last)] if self.start is not None else [])
+        segments = []
+        for first, last in runs:
+            start = max(0, int(first) * self.hop - self.pad)
+            end = min(self.samples, int(last) * self.hop + self.frame + self.pad)
+            if segments and start <= segments[-1][1]:
+                segments[-1] = (segments[-1][0], end)
+            else:
+                segments.append((start, end))
+        return segments
+
+
+def _data_range(fh, path):
+    parsed = parse_header(fh.read(64 * 1024))
+    if parsed is None:
+        raise WavFormatError(f"{path}: no data chunk in the first 64 KiB")
+    fmt, offset, size = parsed
+    if sample_dtype(fmt) is None:
+        raise WavFormatError(f"{path}: {fmt['bits']}-bit samples are not supported")
+    if size in (0, 0xFFFFFFFF):
+        size = os.fstat(fh.fileno()).st_size - offset
+    return fmt, offset, size // fmt['block_align']
+
+
+def detect_speech(path, **options):
+    """Stream a WAV through SilenceDetector. Returns (fmt, segments)."""
+    with open(path, 'rb') as fh:
+        fmt, offset, frames = _data_range(fh, path)
+        detector = SilenceDetector(fmt['sample_rate'], **options)
+        fh.seek(offset)
+        left = frames
+        while left:
+            n = min(READ_FRAMES, left)
+            chunk = fh.read(n * fmt['block_align'])
+            n = len(chunk) // fmt['block_align']
+            if not n:
+                break
+            detector.feed(decode_frames(chunk[:n * fmt['block_align']], fmt, np.float32).mean(axis=1))
+            left -= n
+        return fmt, detector.finish()
+
+
+def copy_frames(src, dst, start, end):
+    """Copy frames [start, end) of WAV src into a new WAV dst; returns dst's stats."""
+    with open(src, 'rb') as fh, open(dst, 'wb') as out:
+        fmt, offset, _ = _data_range(fh, src)
+        size = (end - start) * fmt['block_align']
+        stats = PcmStats(fmt)
+        out.write(wav_header(fmt, size))
+        fh.seek(offset + start * fmt['block_align'])
+        left = size
+        while left:
+            chunk = fh.read(min(READ_FRAMES * fmt['block_align'], left))
+            if not chunk:
+                break
+            out.write(chunk)
+            stats.update(chunk)
+            left -= len(chunk)
+        if size & 1:
+            out.write(b'\0')
+    return stats.result()
+
+
+def split_on_silence(path, mode='split', **options):
+    """
+    Cut silence out of a WAV in place.
+    mode='trim' keeps one file without the leading/trailing silence;
+    mode='split' replaces it with <stem>_000.wav, <stem>_001.wav, ... one per
+    non-silent stretch. Returns one dict per output with its path, start/end
+    (seconds into the original) and audio stats. A file that is silent
+    throughout becomes a single empty WAV.
+    """
+    fmt, segments = detect_speech(path, **options)
+    if mode == 'trim' and segments:
+        segments = [(segments[0][0], segments[-1][1])]
+    segments = segments or [(0, 0)]
+    stem = os.path.splitext(path)[0]
+    rate = fmt['sample_rate']
+    results = []
+    for i, (start, end) in enumerate(segments):
+        dst = f"{path}.part" if mode == 'trim' else f"{stem}_{i:03d}.wav"
+        stats = copy_frames(path, dst, start, end)
+        results.append({'output': dst, 'start': round(start / rate, 3), 'end': round(end / rate, 3), **stats})
+    if mode == 'trim':
+        os.replace(results[0]['output'], path)
+        results[0]['output'] = path
+    else:
+        os.remove(path)
+    return results
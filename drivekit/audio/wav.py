@@ -0,0 +1,193 @@
+# wav.py
+import math
+import struct
+
+import numpy as np
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class WavFormatError(ValueError):
+    pass
+
+
+def parse_header(buf):
+    """
+    Parse the RIFF/fmt/data headers at the start of a WAV.
+    Returns (fmt, data_offset, data_size) where fmt holds format, channels,
+    sample_rate, bits and block_align; data_size may be 0 or 0xFFFFFFFF for
+    a WAV written to a pipe. Returns None when buf is too short.
+    """
+    if len(buf) < 12:
+        return None
+    if buf[:4] != b'RIFF' or buf[8:12] != b'WAVE':
+        raise WavFormatError("not a RIFF/WAVE stream")
+    pos = 12
+    fmt = None
+    while pos + 8 <= len(buf):
+        chunk_id, size = struct.unpack_from('<4sI', buf, pos)
+        body = pos + 8
+        if chunk_id == b'fmt ':
+            if body + 16 > len(buf):
+                return None
+            tag, channels, rate, _, block_align, bits = struct.unpack_from('<HHIIHH', buf, body)
+            if tag == WAVE_FORMAT_EXTENSIBLE and size >= 40 and body + 26 <= len(buf):
+                tag = struct.unpack_from('<H', buf, body + 24)[0]
+            fmt = {'format': tag, 'channels': channels, 'sample_rate': rate,
+                   'bits': bits, 'block_align': block_align}
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise WavFormatError("data chunk before fmt chunk")
+            return fmt, body, size
+        pos = body + size + (size & 1)
+    return None
+
+
+def sample_dtype(fmt):
+    """NumPy dtype of one sample, or None for layouts we do not decode (24-bit)."""
+    if fmt['format'] == WAVE_FORMAT_FLOAT:
+        return {32: np.dtype('<f4'), 64: np.dtype('<f8')}.get(fmt['bits'])
+    if fmt['format'] == WAVE_FORMAT_PCM:
+        return {8: np.dtype('u1'), 16: np.dtype('<i2'), 32: np.dtype('<i4')}.get(fmt['bits'])
+    return None
+
+
+def decode_frames(frames, fmt, dtype=np.float64):
+    """Raw whole frames -> (frames, channels) array scaled to [-1, 1]."""
+    src = sample_dtype(fmt)
+    x = np.frombuffer(frames, dtype=src).reshape(-1, fmt['channels']).astype(dtype)
+    if src.kind == 'u':
+        x -= 128
+        x /= 128
+    elif src.kind == 'i':
+        x /= 2 ** (fmt['bits'] - 1)
+    return x
+
+
+def wav_header(fmt, data_size):
+    """Canonical 44-byte header for data_size bytes of PCM (or float) frames."""
+    return struct.pack('<4sI4s4sIHHIIHH4sI', b'RIFF', 36 + data_size + (data_size & 1), b'WAVE',
+                       b'fmt ', 16, fmt['format'], fmt['channels'], fmt['sample_rate'],
+                       fmt['sample_rate'] * fmt['block_align'], fmt['block_align'], fmt['bits'],
+                       b'data', data_size)
+
+
+def _dbfs(value):
+    return round(20 * math.log10(value), 2) if value > 0 else None
+
+
+class PcmStats:
+    """Running frame count, peak and RMS per channel, updated chunk by chunk."""
+
+    def __init__(self, fmt):
+        self.fmt = fmt
+        self.dtype = sample_dtype(fmt)
+        self.channels = fmt['channels']
+        self.frames = 0
+        self.peak = np.zeros(self.channels)
+        self.sumsq = np.zeros(self.channels)
+
+    def update(self, frames):
+        """frames: whole frames as raw bytes."""
+        n = len(frames) // self.fmt['block_align']
+        self.frames += n
+        if self.dtype is None or not n:
+            return
+        x = decode_frames(frames[:n * self.fmt['block_align']], self.fmt)
+        self.peak = np.maximum(self.peak, np.abs(x).max(axis=0))
+        self.sumsq += np.einsum('ij,ij->j', x, x)
+
+    def result(self):
+        rate = self.fmt['sample_rate']
+        stats = {
+            'sample_rate': rate,
+            'channels': self.channels,
+            'bits': self.fmt['bits'],
+            'frames': self.frames,
+            'duration': round(self.frames / rate, 3) if rate else None,
+            'peak_dbfs': None,
+            'rms_dbfs': None,
+        }
+        if self.dtype is not None and self.frames:
+            stats['peak_dbfs'] = _dbfs(float(self.peak.max()))
+            stats['rms_dbfs'] = _dbfs(math.sqrt(float(self.sumsq.sum()) / (self.frames * self.channels)))
+        return stats
+
+
+class WavStreamWriter:
+    """
+    Write a WAV arriving as a byte stream (e.g. ffmpeg's stdout) to path
+    while computing PcmStats over the frames, in one pass. The RIFF and data
+    sizes, unknown while streaming, are patched on close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.fh = open(path, 'wb')
+        self.head = b''
+        self.fmt = None
+        self.data_offset = None
+        self.data_bytes = 0
+        self.stats = None
+        self.rest = b''
+
+    def write(self, data):
+        if self.fmt is None:
+            self.head += data
+            parsed = parse_header(self.head)
+            if parsed is None:
+                return len(data)
+            self.fmt, self.data_offset, _ = parsed
+            self.stats = PcmStats(self.fmt)
+            self.fh.write(self.head[:self.data_offset])
+            data = self.head[self.data_offset:]
+            self.head = b''
+        self.fh.write(data)
+        self.data_bytes += len(data)
+        buf = self.rest + data if self.rest else data
+        whole = len(buf) - len(buf) % self.fmt['block_align']
+        self.stats.update(buf[:whole])
+        self.rest = buf[whole:]
+        return len(data)
+
+    def close(self):
+        """Finish the file and return its stats."""
+        if self.fmt is None:
+            self.fh.close()
+            raise WavFormatError("stream ended before the WAV data chunk")
+        if self.data_bytes & 1:
+            self.fh.write(b'\0')
+        end = self.fh.tell()
+        self.fh.seek(4)
+        self.fh.write(struct.pack('<I', min(end - 8, 0xFFFFFFFF)))
+        self.fh.seek(self.data_offset - 4)
+        self.fh.write(struct.pack('<I', min(self.data_bytes, 0xFFFFFFFF)))
+        self.fh.close()
+        return self.stats.result()
+
+
+def wav_stats(path, chunk_size=1024 * 1024):
+    """Stats for a WAV already on disk (one sequential read)."""
+    with open(path, 'rb') as fh:
+        head = fh.read(64 * 1024)
+        parsed = parse_header(head)
+        if parsed is None:
+            raise WavFormatError(f"{path}: no data chunk in the first 64 KiB")
+        fmt, offset, size = parsed
+        stats = PcmStats(fmt)
+        fh.seek(offset)
+        left = size if size not in (0, 0xFFFFFFFF) else None
+        rest = b''
+        while left is None or left > 0:
+            chunk = fh.read(chunk_size if left is None else min(chunk_size, left))
+            if not chunk:
+                break
+            if left is not None:
+                left -= len(chunk)
+            buf = rest + chunk
+            whole = len(buf) - len(buf) % fmt['block_align']
+            stats.update(buf[:whole])
+            rest = buf[whole:]
+    return stats.result()
@@ -0,0 +1,123 @@
+# auth.py
+import os
+import pickle
+import datetime
+import threading
+
+SCOPES = ['https://www.googleapis.com/auth/drive']
+
+REFRESH_MARGIN = 300  # seconds before expiry at which the token is renewed
+
+
+def _utcnow():
+    # google-auth keeps `expiry` as a naive UTC datetime
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+class CredentialManager:
+    """
+    Loads token.pickle once and hands the same credentials to every thread.
+    The token is refreshed under a lock a few minutes before it expires, so
+    workers never race each other to refresh an expired token mid-run.
+    """
+
+    def __init__(self, token_path='token.pickle', client_secrets='credentials.json',
+                 scopes=SCOPES, refresh_margin=REFRESH_MARGIN):
+        self.token_path = token_path
+        self.client_secrets = client_secrets
+        self.scopes = scopes
+        self.refresh_margin = datetime.timedelta(seconds=refresh_margin)
+        self._creds = None
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def _stale(self, creds):
+        if not creds.token:
+            return True
+        if not creds.expiry:
+            return False
+        return _utcnow() >= creds.expiry - self.refresh_margin
+
+    def _save(self, creds):
+        with open(self.token_path, 'wb') as token:
+            pickle.dump(creds, token)
+
+    def _refresh(self, creds):
+        # imported here so that `--help` and argument errors stay fast
+        from google.auth.transport.requests import Request
+        creds.refresh(Request())
+        self._save(creds)
+
+    def _schedule(self):
+        # renew in the background too, so long downloads that never call get()
+        # near expiry still see a fresh token in their authorized http client
+        if self._timer is not None:
+            self._timer.cancel()
+        if not self._creds.expiry or not self._creds.refresh_token:
+            return
+        delay = (self._creds.expiry - self.refresh_margin - _utcnow()).total_seconds()
+        self._timer = threading.Timer(max(delay, 1), self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self):
+        try:
+            self.get()
+        except Exception as e:
+            print(f"[!] Background token refresh failed: {e}")
+
+    def _load(self):
+        creds = None
+        if os.path.exists(self.token_path):
+            with open(self.token_path, 'rb') as token:
+                creds = pickle.load(token)
+        if creds and creds.refresh_token and self._stale(creds):
+            self._refresh(creds)
+        elif not creds or not creds.valid:
+            from google_auth_oauthlib.flow import InstalledAppFlow
+            flow = InstalledAppFlow.from_client_secrets_file(self.client_secrets, self.scopes)
+            creds = flow.run_local_server(port=0)
+            self._save(creds)
+        return creds
+
+    def get(self):
+        """Return valid credentials, refreshing them first if they are close to expiry."""
+        creds = self._creds
+        if creds is not None and not self._stale(creds):
+            return creds
+        with self._lock:
+            # another thread may have refreshed while we waited for the lock
+            if self._creds is None:
+                self._creds = self._load()
+            elif self._stale(self._creds):
+                self._refresh(self._creds)
+            else:
+                return self._creds
+            self._schedule()
+            return self._creds
+
+    def invalidate(self, token):
+        """
+        Force a refresh after a 401 seen with `token`. Only the first caller
+        holding the rejected token refreshes; the others reuse its result.
+        """
+        with self._lock:
+            if self._creds is not None and self._creds.token == token:
+                self._refresh(self._creds)
+                self._schedule()
+            return self._creds
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_credential_manager(token_path='token.pickle', client_secrets='credentials.json', scopes=SCOPES):
+    """Return the process-wide manager for token_path, creating it on first use."""
+    key = os.path.abspath(token_path)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = CredentialManager(token_path, client_secrets, scopes)
+            _managers[key] = manager
+        return manager
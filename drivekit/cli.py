@@ -0,0 +1,411 @@
+# cli.py
+import os
+from typing import List
+
+import typer
+
+# heavy modules (googleapiclient, rich) are imported inside each command,
+# so `--help` and argument errors return without loading them
+from drivekit import verify as verify_mod
+from drivekit.auth import SCOPES, get_credential_manager
+
+app = typer.Typer(help="Google Drive listing, metadata, download, ZIP and verification tools, and S3 bulk copy.")
+
+TokenOpt = typer.Option('token.pickle', help="Pickled OAuth token")
+SecretsOpt = typer.Option('credentials.json', help="OAuth client secrets")
+WorkersOpt = typer.Option(None, help="Parallel downloads (default: drivekit.download.MAX_WORKERS)")
+RootOpt = typer.Option(None, help="Read FOLDER_ID as a path (A000053/sub) below this folder ID; "
+                                  "a FOLDER_ID with a '/' is a path below My Drive")
+
+
+def _auth(token, credentials):
+    return get_credential_manager(token, credentials, SCOPES)
+
+
+def _folder(auth, folder_id, root):
+    """folder_id itself, or the ID of the path it names (cached, see drivekit.resolver)."""
+    if root is None and '/' not in folder_id:
+        return folder_id
+    from drivekit.resolver import resolve_path
+
+    try:
+        return resolve_path(auth, folder_id, root or 'root')
+    except FileNotFoundError as e:
+        typer.echo(f"[!] {e}")
+        raise typer.Exit(code=1)
+
+
+@app.command('du')
+def du_cmd(folder_id: str,
+           output: str = typer.Argument("drive_folder.csv", help="Per-folder totals (CSV)"),
+           depth: int = typer.Option(1, help="Folder depth printed to the terminal"),
+           files_output: str = typer.Option(None, help="Also stream the file listing here (.csv or .parquet)"),
+           root: str = RootOpt,
+           token: str = TokenOpt, credentials: str = SecretsOpt):
+    """Files and bytes below every folder of a Drive folder, from one parallel crawl."""
+    from drivekit.listing import FILE_FIELDS, folder_totals, write_folder_totals
+
+    auth = _auth(token, credentials)
+    folder_id = _folder(auth, folder_id, root)
+    if files_output:
+        from drivekit.export import ListingWriter
+
+        with ListingWriter(files_output) as listing:
+            totals = folder_totals(auth, folder_id, fields=FILE_FIELDS, on_item=listing.write)
+        typer.echo(f"💾 File list saved as: {files_output}")
+    else:
+        totals = folder_totals(auth, folder_id)
+    write_folder_totals(totals, output)
+    for row in sorted(totals.values(), key=lambda row: -row['bytes']):
+        if 0 < row['depth'] <= depth:
+            typer.echo(f"{row['bytes'] / (1024 * 1024):12.2f} MB {row['files']:8d} files  {row['path']}")
+    total = totals[folder_id]
+    typer.echo(f"📦 Total: {total['files']} files, {total['bytes'] / (1024 * 1024):.2f} MB in {len(totals) - 1} folders")
+    typer.echo(f"💾 Per-folder totals saved as: {output}")
+
+
+@app.command('metadata')
+def metadata_cmd(ids: str = typer.Argument(..., help="File IDs: a listing (.csv/.parquet) or one ID per line"),
+                 output: str = typer.Argument("drive_metadata.csv", help="Refreshed records (.csv or .parquet)"),
+                 workers: int = typer.Option(None, help="Batch calls in flight (default: drivekit.metadata.BATCH_WORKERS)"),
+                 token: str = TokenOpt, credentials: str = SecretsOpt):
+    """Fresh metadata for many file IDs, 100 per HTTP call through the Drive batch endpoint."""
+    from drivekit import metadata
+    from drivekit.export import ListingWriter
+
+    file_ids = metadata.read_ids(ids)
+    found, failed = metadata.fetch_metadata(_auth(token, credentials), file_ids,
+                                            max_workers=workers or metadata.BATCH_WORKERS)
+    with ListingWriter(output) as listing:
+        for file_id in dict.fromkeys(file_ids):
+            if file_id in found:
+                listing.write(found[file_id])
+    typer.echo(f"💾 {len(found)} of {len(found) + len(failed)} records saved as: {output}")
+    if failed:
+        for file_id, error in list(failed.items())[:10]:
+            typer.echo(f"[!] {file_id}: {error}")
+        raise typer.Exit(code=1)
+
+
+@app.command('resolve')
+def resolve_cmd(paths: List[str] = typer.Argument(..., help="Paths such as A000053/sub/file.pdf"),
+                root: str = typer.Option('root', help="Folder ID the paths start from (default: My Drive)"),
+                from_file: bool = typer.Option(False, "--from-file", help="PATHS are files listing one path per line"),
+                refresh: bool = typer.Option(False, help="Ignore cached entries and look every level up again"),
+                token: str = TokenOpt, credentials: str = SecretsOpt):
+    """Print the Drive ID of each path, from the local path cache where possible."""
+    from drivekit import resolver
+
+    if from_file:
+        paths = [line.strip() for name in paths for line in open(name, encoding='utf-8') if line.strip()]
+    cache = resolver.PathCache(ttl=0 if refresh else resolver.CACHE_TTL)
+    try:
+        ids = resolver.resolve_paths(_auth(token, credentials), paths, root, cache)
+    finally:
+        cache.close()
+    for path, file_id in ids.items():
+        typer.echo(f"{file_id or '-'}\t{path}")
+    missing = [path for path, file_id in ids.items() if file_id is None]
+    if missing:
+        typer.echo(f"[!] {len(missing)} of {len(ids)} paths not found")
+        raise typer.Exit(code=1)
+
+
+@app.command('download')
+def download_cmd(folder_id: str,
+                 output: str = typer.Argument("downloads"),
+                 workers: int = WorkersOpt,
+                 root: str = RootOpt,
+                 token: str = TokenOpt, credentials: str = SecretsOpt):
+    """Download every file below a Drive folder, keeping its folder layout."""
+    from drivekit import download
+
+    auth = _auth(token, credentials)
+    folder_id = _folder(auth, folder_id, root)
+    os.makedirs(output, exist_ok=True)
+    typer.echo(f"📂 Download path: {os.path.abspath(output)}")
+    files, failed = download.download_folder(auth, folder_id, output,
+                                              max_workers=workers or download.MAX_WORKERS)
+    typer.echo(f"🎉 {len(files) - len(failed)} of {len(files)} files downloaded.")
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@app.command('zip')
+def zip_cmd(folder_id: str,
+            output_zip: str = typer.Argument("drive_folder.zip"),
+            workers: int = WorkersOpt,
+            root: str = RootOpt,
+            token: str = TokenOpt, credentials: str = SecretsOpt):
+    """Download every file below a Drive folder into a single ZIP."""
+    from drivekit import archive, download
+
+    auth = _auth(token, credentials)
+    files, failed = archive.download_and_zip_folder(auth, _folder(auth, folder_id, root), output_zip,
+                                                    max_workers=workers or download.MAX_WORKERS)
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@app.command('shards')
+def shards_cmd(folder_id: str,
+               out_dir: str = typer.Argument("shards"),
+               shard_size: int = typer.Option(1024, help="Shard size in MB"),
+               workers: int = WorkersOpt,
+               root: str = RootOpt,
+               token: str = TokenOpt, credentials: str = SecretsOpt):
+    """Download every file below a Drive folder into fixed-size tar shards."""
+    from drivekit import archive, download
+
+    auth = _auth(token, credentials)
+    files, failed = archive.download_to_shards(auth, _folder(auth, folder_id, root), out_dir,
+                                               max_size=shard_size * 1024 * 1024,
+                                               max_workers=workers or download.MAX_WORKERS)
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@app.command('concat')
+def concat_cmd(src_dir: str,
+               out_dir: str = typer.Argument("sessions"),
+               pattern: str = typer.Option(None, help="Regex with 'session' and 'index' groups "
+                                                      "(default: <session>_<n>.wav)"),
+               workers: int = typer.Option(None, help="Sessions joined in parallel")):
+    """
+    Join numbered segment WAVs (A000672_t1_1.wav, A000672_t1_2.wav, ...) into
+    one WAV per session, in numeric order.
+    """
+    from drivekit.audio import concat
+
+    results = concat.concat_sessions(src_dir, out_dir, pattern=pattern or concat.SEGMENT_PATTERN,
+                                     max_workers=workers or concat.CONCAT_WORKERS)
+    failed = [r for r in results if not r['success']]
+    typer.echo(f"🎧 {len(results) - len(failed)} of {len(results)} sessions written to {out_dir}")
+    if failed:
+        raise typer.Exit(code=1)
+
+
+def _report_mismatches(failed, checked, report):
+    if failed:
+        verify_mod.write_report(failed, report)
+        typer.echo(f"[!] {len(failed)} of {checked} files do not match their source; see {report}")
+        raise typer.Exit(code=1)
+    typer.echo(f"✅ {checked} files match their source")
+
+
+@app.command('verify-download')
+def verify_download_cmd(folder_id: str,
+                        output: str = typer.Argument("downloads"),
+                        report: str = typer.Option("verify_report.csv", help="Mismatch report (CSV)"),
+                        workers: int = typer.Option(verify_mod.MAX_WORKERS, help="Number of hashing processes"),
+                        root: str = RootOpt,
+                        token: str = TokenOpt, credentials: str = SecretsOpt):
+    """Check a `download` tree against Drive: every file present, same size and md5Checksum."""
+    from drivekit.listing import list_files
+
+    auth = _auth(token, credentials)
+    files = list_files(auth, _folder(auth, folder_id, root))
+    failed, checked = verify_mod.verify_files(verify_mod.drive_entries(files, output), max_workers=workers)
+    _report_mismatches(failed, checked, report)
+
+
+@app.command('drive-to-s3')
+def drive_to_s3_cmd(folder_id: str,
+                    url: str = typer.Argument(..., help="s3://bucket/prefix/ to upload into"),
+                    workers: int = typer.Option(None, help="Files streamed at once (default: drivekit.s3.upload.TRANSFER_WORKERS)"),
+                    part_workers: int = typer.Option(None, help="Part uploads in flight (default: drivekit.s3.upload.PART_WORKERS)"),
+                    endpoint_url: str = typer.Option(None, help="S3 endpoint (MinIO, moto server)"),
+                    profile: str = typer.Option(None, help="AWS profile"),
+                    root: str = RootOpt,
+                    token: str = TokenOpt, credentials: str = SecretsOpt):
+    """
+    Stream every file below a Drive folder straight into S3 as multipart
+    uploads, keeping the folder layout; nothing is written to local disk.
+    """
+    from drivekit.s3 import copy, upload
+    from drivekit.s3.manifest import parse_s3_url
+
+    bucket, prefix = parse_s3_url(url)
+    workers = workers or upload.TRANSFER_WORKERS
+    part_workers = part_workers or upload.PART_WORKERS
+    auth = _auth(token, credentials)
+    files, failed = upload.transfer_folder(auth, _folder(auth, folder_id, root), bucket, prefix,
+                                           client=copy.make_client(workers + part_workers, endpoint_url, profile),
+                                           max_workers=workers, part_workers=part_workers)
+    typer.echo(f"🎉 {len(files) - len(failed)} of {len(files)} files uploaded to {url}")
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@app.command('s3-copy')
+def s3_copy_cmd(manifests: List[str] = typer.Argument(..., help="Files of `aws s3 cp SRC DEST` lines"),
+                base_dir: str = typer.Option('.', help="Local destinations are relative to this"),
+                workers: int = typer.Option(None, help="Concurrent copies (default: drivekit.s3.copy.COPY_WORKERS)"),
+                multipart_threshold: int = typer.Option(256, help="Copy objects larger than this (MB) in parts"),
+                part_size: int = typer.Option(64, help="Multipart copy part size in MB"),
+                part_workers: int = typer.Option(None, help="Concurrent UploadPartCopy calls (0: never multipart)"),
+                skip_existing: bool = typer.Option(True, help="Skip destinations that already hold the same object"),
+                endpoint_url: str = typer.Option(None, help="S3 endpoint (MinIO, moto server)"),
+                profile: str = typer.Option(None, help="AWS profile")):
+    """
+    Run the copies listed in aws-cli manifest files (or their .parquet form) in one process: server-side
+    CopyObject for s3:// destinations (UploadPartCopy in parallel parts above
+    --multipart-threshold), ranged GETs for local ones.
+
+    Repeated lines (also across overlapping manifests) run once, and with
+    --skip-existing sources and destinations are inventoried with a few
+    paginated listings so objects already copied with the same size and
+    ETag are skipped; re-running a manifest is close to free.
+    """
+    from drivekit.s3 import copy
+    from drivekit.s3.inventory import plan_copies
+    from drivekit.s3.manifest import dedupe_jobs, read_manifests
+
+    jobs, duplicates, conflicts = dedupe_jobs(read_manifests(manifests))
+    workers = workers or copy.COPY_WORKERS
+    part_workers = copy.PART_WORKERS if part_workers is None else part_workers
+    typer.echo(f"📄 {len(jobs)} copies in {len(manifests)} manifest(s), {duplicates} duplicate lines dropped")
+    if conflicts:
+        typer.echo(f"[!] {conflicts} destinations are written by more than one source; the last line wins")
+    client = copy.make_client(workers + part_workers, endpoint_url, profile)
+    if skip_existing:
+        jobs, skipped = plan_copies(client, jobs, base_dir)
+        typer.echo(f"⏭️ {len(skipped)} already at the destination, {len(jobs)} to copy")
+    results = copy.copy_jobs(jobs, client,
+                             max_workers=workers, base_dir=base_dir,
+                             multipart_threshold=multipart_threshold * 1024 * 1024,
+                             part_size=part_size * 1024 * 1024, part_workers=part_workers)
+    failed = [r for r in results if not r['success']]
+    for r in failed:
+        typer.echo(f"    - {r['src']}: {r['error']}")
+    typer.echo(f"🎉 {len(results) - len(failed)} of {len(results)} objects copied.")
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@app.command('s3-verify')
+def s3_verify_cmd(manifests: List[str] = typer.Argument(..., help="Manifests with local destinations"),
+                  base_dir: str = typer.Option('.', help="Local destinations are relative to this"),
+                  report: str = typer.Option("verify_report.csv", help="Mismatch report (CSV)"),
+                  workers: int = typer.Option(verify_mod.MAX_WORKERS, help="Number of hashing processes"),
+                  endpoint_url: str = typer.Option(None, help="S3 endpoint (MinIO, moto server)"),
+                  profile: str = typer.Option(None, help="AWS profile")):
+    """
+    Check files copied to local disk by a manifest against the S3 sources'
+    size and ETag (multipart ETags included).
+    """
+    from drivekit.s3 import copy
+    from drivekit.s3.inventory import verify_entries
+    from drivekit.s3.manifest import dedupe_jobs, read_manifests
+
+    jobs, _, _ = dedupe_jobs(read_manifests(manifests))
+    entries = verify_entries(copy.make_client(endpoint_url=endpoint_url, profile=profile), jobs, base_dir)
+    failed, checked = verify_mod.verify_files(entries, max_workers=workers)
+    _report_mismatches(failed, checked, report)
+
+
+@app.command('s3-inventory')
+def s3_inventory_cmd(url: str = typer.Argument(..., help="s3://bucket/prefix to list"),
+                     output: str = typer.Argument("inventory.parquet", help=".parquet or .csv"),
+                     workers: int = typer.Option(None, help="Concurrent listings (default: drivekit.s3.inventory.LIST_WORKERS)"),
+                     endpoint_url: str = typer.Option(None, help="S3 endpoint (MinIO, moto server)"),
+                     profile: str = typer.Option(None, help="AWS profile")):
+    """
+    Write key, size, etag and last-modified of every object under a prefix,
+    listing job/task/asset partitions of the keyspace in parallel.
+    """
+    from rich.progress import Progress
+    from drivekit.s3 import copy, inventory
+    from drivekit.s3.manifest import parse_s3_url
+
+    bucket, prefix = parse_s3_url(url)
+    workers = workers or inventory.LIST_WORKERS
+    writer = inventory.InventoryWriter(output)
+    with Progress() as progress:
+        task = progress.add_task("[cyan]Listing...", total=None)
+
+        def on_rows(rows):
+            writer.write(rows)
+            progress.advance(task, len(rows))
+
+        count = inventory.inventory_prefix(copy.make_client(workers, endpoint_url, profile), bucket, prefix,
+                                           on_rows, max_workers=workers)
+    writer.close()
+    typer.echo(f"📦 {count} objects written to {output}")
+
+
+@app.command('s3-audio-stats')
+def s3_audio_stats_cmd(manifests: List[str] = typer.Argument(..., help="Manifests whose sources are WAVs"),
+                       report: str = typer.Option(None, help="Write totals per speaker and job as JSON"),
+                       per_file: str = typer.Option(None, help="Write one CSV row per WAV"),
+                       workers: int = typer.Option(None, help="Concurrent header reads (default: drivekit.s3.wavstats.STATS_WORKERS)"),
+                       endpoint_url: str = typer.Option(None, help="S3 endpoint (MinIO, moto server)"),
+                       profile: str = typer.Option(None, help="AWS profile")):
+    """
+    Hours of audio per speaker and per job for the WAVs a manifest copies,
+    from the first few hundred bytes of each object instead of the whole file.
+    """
+    import csv
+    import json
+    from drivekit.s3 import copy, wavstats
+    from drivekit.s3.manifest import read_manifests
+
+    objects = sorted({(j['src_bucket'], j['src_key']) for j in read_manifests(manifests)})
+    workers = workers or wavstats.STATS_WORKERS
+    results = wavstats.collect_stats(copy.make_client(workers, endpoint_url, profile), objects, max_workers=workers)
+    stats = wavstats.aggregate(results)
+    if per_file:
+        fields = ['bucket', 'key', 'duration', 'sample_rate', 'channels', 'bits', 'data_bytes', 'bytes', 'error']
+        with open(per_file, 'w', newline='', encoding='utf-8') as fh:
+            writer = csv.DictWriter(fh, fieldnames=fields, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(sorted(results, key=lambda r: r['key']))
+    if report:
+        with open(report, 'w', encoding='utf-8') as fh:
+            json.dump(stats, fh, indent=1)
+    for job, row in stats['jobs'].items():
+        typer.echo(f"    job {job}: {row['files']} files, {row['hours']} h")
+    total = stats['total']
+    typer.echo(f"🎧 {total['files']} WAVs, {total['hours']} h, {len(stats['speakers'])} speakers, "
+               f"{len(stats['jobs'])} jobs")
+    if total['files'] < len(objects):
+        typer.echo(f"[!] {len(objects) - total['files']} objects could not be read")
+        raise typer.Exit(code=1)
+
+
+@app.command('s3-manifest')
+def s3_manifest_cmd(src: str = typer.Argument(..., help="Manifest to convert (.txt or .parquet)"),
+                    dst: str = typer.Argument(..., help="Output; .parquet for columnar, anything else for text")):
+    """
+    Convert an `aws s3 cp` manifest between the text form and the columnar
+    Parquet form (also accepted by s3-copy).
+    """
+    from drivekit.s3 import manifest
+
+    jobs = list(manifest.read_manifest(src))
+    if dst.endswith('.parquet'):
+        manifest.write_columnar(jobs, dst)
+    else:
+        manifest.write_text(jobs, dst)
+    typer.echo(f"📄 {len(jobs)} lines: {src} ({os.path.getsize(src)} bytes) -> {dst} ({os.path.getsize(dst)} bytes)")
+
+
+@app.command('verify')
+def verify(zip_path: str,
+           check_md5: bool = typer.Option(False, "--md5", help="Also compare against Drive md5Checksum"),
+           manifest: str = typer.Option(None, help="md5 manifest (default: <zip>.md5.json)"),
+           workers: int = typer.Option(verify_mod.MAX_WORKERS, help="Number of verifier processes")):
+    """
+    Check CRC-32 and size of every member of a ZIP built by download_and_zip_folder.
+    """
+    failed, checked = verify_mod.verify_zip(zip_path, check_md5=check_md5, manifest=manifest, max_workers=workers)
+    if failed:
+        typer.echo(f"[!] {len(failed)} of {checked} members failed verification.")
+        for f in failed:
+            typer.echo(f"    - {f['name']}: {f['error']}")
+        raise typer.Exit(code=1)
+    typer.echo(f"✅ {checked} members OK: {zip_path}")
+
+
+if __name__ == '__main__':
+    app()
@@ -0,0 +1,45 @@
+# discovery.py
+import os
+import json
+import threading
+import urllib.request
+
+DISCOVERY_URL = 'https://www.googleapis.com/discovery/v1/apis/drive/v3/rest'
+CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'drivekit', 'drive.v3.json')
+
+_document = None
+_lock = threading.Lock()
+
+
+def _read_document():
+    # newer google-api-python-client releases ship the document in the wheel
+    try:
+        from googleapiclient.discovery_cache import get_static_doc
+        doc = get_static_doc('drive', 'v3')
+        if doc:
+            return doc
+    except ImportError:
+        pass
+    if os.path.exists(CACHE_PATH):
+        with open(CACHE_PATH, 'r', encoding='utf-8') as fh:
+            return fh.read()
+    with urllib.request.urlopen(DISCOVERY_URL, timeout=30) as resp:
+        doc = resp.read().decode('utf-8')
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    with open(CACHE_PATH, 'w', encoding='utf-8') as fh:
+        fh.write(doc)
+    return doc
+
+
+def drive_document():
+    """
+    Parsed Drive v3 discovery document, loaded once per process from the
+    bundled copy or the on-disk cache; the network is only hit the first
+    time on a machine with neither.
+    """
+    global _document
+    if _document is None:
+        with _lock:
+            if _document is None:
+                _document = json.loads(_read_document())
+    return _document
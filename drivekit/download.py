@@ -0,0 +1,151 @@
+# download.py
+import os
+import time
+import random
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseDownload
+from rich.progress import Progress
+
+from drivekit.listing import list_files
+from drivekit.service import thread_service
+
+MAX_WORKERS = 8
+MAX_RETRIES = 6
+INITIAL_BACKOFF = 1.0
+CHUNK_SIZE = 64 * 1024 * 1024  # bytes per ranged GET
+STREAM_CHUNK_SIZE = 4 * 1024 * 1024  # smaller GETs when a consumer processes bytes as they arrive
+DECODE_CHUNK_SIZE = 1024 * 1024  # GETs feeding an ffmpeg pipe: decoding starts after the first MiB
+
+EXPORT_MAP = {
+    'application/vnd.google-apps.document': ('application/vnd.openxmlformats-officedocument.wordprocessingml.document', '.docx'),
+    'application/vnd.google-apps.spreadsheet': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', '.xlsx'),
+    'application/vnd.google-apps.presentation': ('application/vnd.openxmlformats-officedocument.presentationml.presentation', '.pptx'),
+}
+
+
+def safe_name(name: str) -> str:
+    return name.replace(os.path.sep, "_")
+
+
+def target_name(file_meta):
+    """File name on disk, with the export extension for Google Docs/Sheets/Slides."""
+    name = file_meta.get('name', file_meta['id'])
+    mime = file_meta.get('mimeType', '')
+    if mime in EXPORT_MAP:
+        ext = EXPORT_MAP[mime][1]
+        if not name.endswith(ext):
+            name += ext
+    return name
+
+
+def media_request(service, file_meta):
+    """get_media for binary files, export_media for Google Docs/Sheets/Slides."""
+    mime = file_meta.get('mimeType', '')
+    if mime in EXPORT_MAP:
+        return service.files().export_media(fileId=file_meta['id'], mimeType=EXPORT_MAP[mime][0])
+    return service.files().get_media(fileId=file_meta['id'], supportsAllDrives=True)
+
+
+def fetch(service, file_meta, fh, chunk_size=CHUNK_SIZE):
+    """Download the content of file_meta into the open binary file fh."""
+    downloader = MediaIoBaseDownload(fh, media_request(service, file_meta), chunksize=chunk_size)
+    done = False
+    while not done:
+        status, done = downloader.next_chunk()
+
+
+def _http_status(he):
+    try:
+        return int(he.resp.status)
+    except Exception:
+        return None
+
+
+def with_retries(func, auth, name, no_retry=()):
+    """
+    Call func() and retry it with jittered exponential backoff on throttling,
+    server errors and network failures. A 401 refreshes the shared token first.
+    Exceptions in no_retry are raised straight away.
+    """
+    backoff = INITIAL_BACKOFF
+    for attempt in range(1, MAX_RETRIES + 1):
+        token = auth.get().token
+        try:
+            return func()
+        except no_retry:
+            raise
+        except HttpError as he:
+            code = _http_status(he)
+            if code == 401:
+                auth.invalidate(token)
+            elif not (code in (403, 429) or (code and 500 <= code < 600)):
+                raise
+            reason = code
+        except Exception as e:
+            reason = type(e).__name__
+        if attempt == MAX_RETRIES:
+            break
+        wait = backoff + random.uniform(0, 0.5)
+        print(f"[Retry {attempt}] {name} -> {reason}, waiting {wait:.1f}s")
+        time.sleep(wait)
+        backoff *= 2
+    raise RuntimeError('max retries exceeded')
+
+
+def download_worker(file_meta, auth, dest_dir=None):
+    """
+    Download one file and return a result dict. With dest_dir the file keeps
+    its relative folder path below dest_dir, otherwise it goes to a temp file.
+    """
+    file_id = file_meta['id']
+    name = target_name(file_meta)
+    md5 = None if file_meta.get('mimeType') in EXPORT_MAP else file_meta.get('md5Checksum')
+
+    if dest_dir is None:
+        tmpf = tempfile.NamedTemporaryFile(delete=False)
+        path = tmpf.name
+        tmpf.close()
+    else:
+        folder = os.path.join(dest_dir, file_meta.get('path', ''))
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, safe_name(name))
+
+    def attempt():
+        with open(path, 'wb') as fh:
+            fetch(thread_service(auth), file_meta, fh)
+
+    try:
+        with_retries(attempt, auth, name)
+        return {'id': file_id, 'name': name, 'path': path, 'md5': md5, 'success': True, 'error': None}
+    except Exception as e:
+        if dest_dir is None and os.path.exists(path):
+            os.remove(path)
+        error = f'HttpError {_http_status(e)}' if isinstance(e, HttpError) else str(e)
+        return {'id': file_id, 'name': name, 'path': None, 'md5': md5, 'success': False, 'error': error}
+
+
+def download_files(files, auth, dest_dir=None, max_workers=MAX_WORKERS):
+    """Download files concurrently and yield each result dict as it completes."""
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futures = [ex.submit(download_worker, f, auth, dest_dir) for f in files]
+        for fut in as_completed(futures):
+            yield fut.result()
+
+
+def download_folder(auth, folder_id, output='downloads', max_workers=MAX_WORKERS):
+    """Download every file below folder_id into output, keeping the folder layout."""
+    print("[+] Listing files...")
+    files = list_files(auth, folder_id)
+    print(f"[+] Found {len(files)} files. Using {max_workers} workers.")
+    failed = []
+    with Progress() as progress:
+        task = progress.add_task("Downloading...", total=len(files))
+        for res in download_files(files, auth, dest_dir=output, max_workers=max_workers):
+            if not res['success']:
+                failed.append(res)
+                progress.console.print(f"[!] Failed: {res['name']} -> {res['error']}")
+            progress.advance(task)
+    return files, failed
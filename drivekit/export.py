@@ -0,0 +1,110 @@
+# export.py
+import os
+import csv
+import json
+
+from drivekit.listing import FOLDER_MIME
+
+LISTING_COLUMNS = ['id', 'name', 'path', 'mimeType', 'size', 'md5Checksum', 'modifiedTime']
+ROW_GROUP_ROWS = 100000  # rows per Parquet part file
+FLUSH_ROWS = 1000        # CSV rows between flushes (one Drive page)
+
+
+class ListingWriter:
+    """
+    Stream file-meta records to CSV or, for a path ending in .parquet, to a
+    Parquet dataset directory (part-00000.parquet, ...; zstd, needs pyarrow)
+    with one part file per ROW_GROUP_ROWS rows. Every finished part is a
+    complete Parquet file, so a run killed part-way still leaves readable
+    results, and memory stays at one row group.
+
+    Running totals (files, folders, bytes) are kept as rows arrive and
+    written to <path>.summary.json at every flush, with 'complete' set once
+    close() has run.
+    """
+
+    def __init__(self, path, columns=LISTING_COLUMNS, row_group_rows=ROW_GROUP_ROWS):
+        self.path = path
+        self.columns = columns
+        self.row_group_rows = row_group_rows
+        self.summary_path = path.rstrip('/') + '.summary.json'
+        self.totals = {'files': 0, 'folders': 0, 'bytes': 0, 'parts': 0, 'complete': False}
+        self.rows = []
+        self.csv = None
+        if not path.endswith('.parquet'):
+            self.fh = open(path, 'w', newline='', encoding='utf-8')
+            self.csv = csv.DictWriter(self.fh, fieldnames=columns, extrasaction='ignore')
+            self.csv.writeheader()
+            return
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise RuntimeError("Parquet listings need pyarrow: pip install pyarrow (or write .csv)")
+        self.schema = pa.schema([(c, pa.int64() if c == 'size' else pa.string()) for c in columns])
+        os.makedirs(path, exist_ok=True)
+        # a fresh listing: parts of an earlier run would mix with this one
+        for name in os.listdir(path):
+            if name.startswith('part-') and name.endswith('.parquet'):
+                os.remove(os.path.join(path, name))
+
+    def write(self, meta):
+        """Add one record; folders (mimeType folder) count as folders, not files."""
+        if meta.get('mimeType') == FOLDER_MIME:
+            self.totals['folders'] += 1
+        else:
+            self.totals['files'] += 1
+            self.totals['bytes'] += int(meta.get('size') or 0)
+        row = {c: meta.get(c) for c in self.columns}
+        if self.csv:
+            self.csv.writerow(row)
+            if (self.totals['files'] + self.totals['folders']) % FLUSH_ROWS == 0:
+                self.flush()
+            return
+        if row.get('size') is not None:
+            row['size'] = int(row['size'])
+        self.rows.append(row)
+        if len(self.rows) >= self.row_group_rows:
+            self.flush()
+
+    def flush(self):
+        if self.csv:
+            self.fh.flush()
+        elif self.rows:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            name = f"part-{self.totals['parts']:05d}.parquet"
+            tmp = os.path.join(self.path, name + '.tmp')
+            pq.write_table(pa.Table.from_pylist(self.rows, schema=self.schema), tmp, compression='zstd')
+            os.replace(tmp, os.path.join(self.path, name))
+            self.totals['parts'] += 1
+            self.rows = []
+        self._write_summary()
+
+    def _write_summary(self):
+        tmp = self.summary_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump(self.totals, fh, indent=1)
+        os.replace(tmp, self.summary_path)
+
+    def close(self):
+        if not self.csv and not self.totals['parts'] and not self.rows:
+            import pyarrow.parquet as pq
+            pq.write_table(self.schema.empty_table(), os.path.join(self.path, 'part-00000.parquet'))
+            self.totals['parts'] = 1
+        self.totals['complete'] = True
+        self.flush()
+        if self.csv:
+            self.fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            # keep what was listed so far; the summary stays 'complete': false
+            self.flush()
+            if self.csv:
+                self.fh.close()
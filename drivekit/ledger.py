@@ -0,0 +1,92 @@
+# ledger.py
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+from drivekit.shards import sample_exists
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_md5(path):
+    md5 = hashlib.md5()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def output_exists(output):
+    """
+    True if a recorded output is still there; '<shard>.tar#<key>' refers to
+    a tar shard and also needs the key listed in its shards.json.
+    """
+    if '.tar#' in output:
+        return sample_exists(output)
+    return os.path.exists(output)
+
+
+class ConversionLedger:
+    """
+    SQLite record of finished and failed conversions, keyed by Drive file id
+    and modifiedTime, so a re-run only redoes new, changed or failed files.
+    Safe to call from pipeline callbacks on several threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS conversions (
+                file_id       TEXT NOT NULL,
+                modified_time TEXT NOT NULL,
+                name          TEXT,
+                status        TEXT NOT NULL,
+                output        TEXT,
+                md5           TEXT,
+                error         TEXT,
+                updated_at    REAL,
+                PRIMARY KEY (file_id, modified_time)
+            )''')
+        self.conn.commit()
+
+    def completed(self):
+        """{(file_id, modified_time): output} for every finished conversion."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT file_id, modified_time, output FROM conversions WHERE status = 'done'").fetchall()
+        return {(fid, mtime): output for fid, mtime, output in rows}
+
+    def pending(self, files):
+        """Files with no finished conversion whose output is still on disk."""
+        done = self.completed()
+        todo = []
+        for f in files:
+            output = done.get((f['id'], f.get('modifiedTime', '')))
+            if not output or not output_exists(output):
+                todo.append(f)
+        return todo
+
+    def record(self, file_meta, output=None, error=None, md5=None):
+        """Store the outcome of one conversion; a local output is checksummed on success."""
+        if md5 is None and error is None and output and os.path.isfile(output):
+            md5 = file_md5(output)
+        with self._lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO conversions VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (file_meta['id'], file_meta.get('modifiedTime', ''), file_meta.get('name'),
+                 'failed' if error else 'done', output, md5, error, time.time()))
+            self.conn.commit()
+
+    def failures(self):
+        with self._lock:
+            return self.conn.execute(
+                "SELECT file_id, name, error FROM conversions WHERE status = 'failed'").fetchall()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,145 @@
+# listing.py
+import os
+import csv
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from drivekit.service import thread_service
+
+FOLDER_MIME = 'application/vnd.google-apps.folder'
+
+PAGE_SIZE = 1000      # Drive maximum, fewer round trips per folder
+LIST_WORKERS = 8      # folders listed concurrently
+FILE_FIELDS = 'id, name, mimeType, size, md5Checksum, modifiedTime'
+
+
+def list_page(service, folder_id, query=None, fields=FILE_FIELDS, page_token=None):
+    """One page of folder_id's children: (files, next_page_token)."""
+    q = f"'{folder_id}' in parents and trashed=false"
+    if query:
+        q += f" and ({query})"
+    resp = service.files().list(
+        q=q,
+        spaces='drive',
+        fields=f'nextPageToken, files({fields})',
+        pageSize=PAGE_SIZE,
+        includeItemsFromAllDrives=True,
+        supportsAllDrives=True,
+        pageToken=page_token
+    ).execute()
+    return resp.get('files', []), resp.get('nextPageToken')
+
+
+def list_children(service, folder_id, query=None, fields=FILE_FIELDS):
+    """Yield every direct child of folder_id, following pagination."""
+    page_token = None
+    while True:
+        files, page_token = list_page(service, folder_id, query, fields, page_token)
+        yield from files
+        if not page_token:
+            break
+
+
+def _list_folder_page(auth, folder_id, path, query, fields, page_token=None):
+    # folders must always come back when recursing, even with a mimeType filter
+    if query:
+        query = f"({query}) or mimeType='{FOLDER_MIME}'"
+    items, next_token = list_page(thread_service(auth), folder_id, query, fields, page_token)
+    files, folders = [], []
+    for f in items:
+        f['path'] = path
+        f['parent'] = folder_id
+        if f.get('mimeType') == FOLDER_MIME:
+            folders.append(f)
+        else:
+            files.append(f)
+    return files, folders, next_token
+
+
+def iter_files(auth, folder_id, recursive=True, query=None, fields=FILE_FIELDS,
+               max_workers=LIST_WORKERS, include_folders=False):
+    """
+    Yield file-meta dicts below folder_id page by page as the listing runs.
+    Subfolders (and the next page of a large folder) are listed
+    concurrently, so memory holds a few pages, not a folder. Each record
+    gets a 'path' holding its folder path relative to folder_id ('' for
+    direct children) and the 'parent' folder ID it was listed from.
+    """
+    if not recursive:
+        for f in list_children(thread_service(auth), folder_id, query, fields):
+            f['path'] = ''
+            f['parent'] = folder_id
+            yield f
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        pending = {ex.submit(_list_folder_page, auth, folder_id, '', query, fields): (folder_id, '')}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                parent, path = pending.pop(fut)
+                files, folders, next_token = fut.result()
+                if next_token:
+                    pending[ex.submit(_list_folder_page, auth, parent, path, query, fields, next_token)] = (parent, path)
+                yield from files
+                for folder in folders:
+                    if include_folders:
+                        yield folder
+                    sub_path = os.path.join(folder['path'], folder['name'])
+                    pending[ex.submit(_list_folder_page, auth, folder['id'], sub_path, query, fields)] = \
+                        (folder['id'], sub_path)
+
+
+def list_files(auth, folder_id, recursive=True, query=None, fields=FILE_FIELDS, max_workers=LIST_WORKERS):
+    """List all files below folder_id (see iter_files)."""
+    return list(iter_files(auth, folder_id, recursive, query, fields, max_workers))
+
+
+def folder_totals(auth, folder_id, max_workers=LIST_WORKERS, fields='id, name, mimeType, size', on_item=None):
+    """
+    du for a Drive folder: one concurrent crawl of the whole subtree, each
+    file's size and count added to its folder and every ancestor as it
+    arrives. Totals are keyed by folder ID, so sibling folders sharing a
+    name (or with a '/' in it) stay apart. Returns {folder_id: {'path',
+    'parent', 'depth', 'files', 'bytes'}}, folder_id itself having path ''
+    and depth 0. Google Docs count as files of size 0.
+    on_item(meta) sees every file and folder record, e.g. to export the
+    listing from the same crawl.
+    """
+    totals = {folder_id: {'name': '', 'parent': None, 'files': 0, 'bytes': 0}}
+    for f in iter_files(auth, folder_id, fields=fields, max_workers=max_workers, include_folders=True):
+        if on_item:
+            on_item(f)
+        if f.get('mimeType') == FOLDER_MIME:
+            # a folder's record always arrives before anything listed inside it
+            totals[f['id']] = {'name': f['name'], 'parent': f['parent'], 'files': 0, 'bytes': 0}
+            continue
+        size = int(f.get('size') or 0)
+        parent = f['parent']
+        while parent is not None:
+            row = totals[parent]
+            row['files'] += 1
+            row['bytes'] += size
+            parent = row['parent']
+
+    def place(row):
+        if 'path' not in row:
+            if row['parent'] is None:
+                row['path'], row['depth'] = '', 0
+            else:
+                up = place(totals[row['parent']])
+                row['path'], row['depth'] = os.path.join(up['path'], row['name']), up['depth'] + 1
+        return row
+
+    for row in totals.values():
+        place(row)
+        del row['name']
+    return totals
+
+
+def write_folder_totals(totals, path):
+    """CSV with one row per folder: path, id, files and bytes of its whole subtree."""
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(['Path', 'ID', 'Files', 'Size (bytes)'])
+        for folder_id, row in sorted(totals.items(), key=lambda kv: (kv[1]['path'], kv[0])):
+            writer.writerow([row['path'] or '.', folder_id, row['files'], row['bytes']])
@@ -0,0 +1,120 @@
+# metadata.py
+import csv
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from googleapiclient.errors import HttpError
+from rich.progress import Progress
+
+from drivekit.download import INITIAL_BACKOFF, MAX_RETRIES, _http_status, with_retries
+from drivekit.listing import FILE_FIELDS
+from drivekit.service import thread_service
+
+BATCH_SIZE = 100     # Drive's limit of sub-requests per batch call
+BATCH_WORKERS = 4    # batch calls in flight
+
+
+def _retryable(exception):
+    code = _http_status(exception) if isinstance(exception, HttpError) else None
+    return code is None or code in (403, 429) or 500 <= code < 600
+
+
+def _batch_get(auth, ids, fields):
+    """
+    files.get for up to BATCH_SIZE ids in one HTTP call. Returns
+    (found {id: meta}, retry [ids], failed {id: error}); only throttled or
+    server-failed sub-requests land in retry.
+    """
+    service = thread_service(auth)
+    found, retry, failed = {}, [], {}
+
+    def callback(request_id, response, exception):
+        if exception is None:
+            found[request_id] = response
+        elif _retryable(exception):
+            retry.append(request_id)
+        else:
+            failed[request_id] = str(exception)
+
+    def run():
+        found.clear()
+        retry.clear()
+        failed.clear()
+        batch = service.new_batch_http_request(callback=callback)
+        for file_id in ids:
+            batch.add(service.files().get(fileId=file_id, fields=fields, supportsAllDrives=True),
+                      request_id=file_id)
+        batch.execute()
+
+    # the batch call itself failing (network, 5xx on the envelope) retries the whole batch
+    with_retries(run, auth, f"batch of {len(ids)}")
+    return found, retry, failed
+
+
+def fetch_metadata(auth, ids, fields=FILE_FIELDS, batch_size=BATCH_SIZE, max_workers=BATCH_WORKERS):
+    """
+    File-meta dicts for many file IDs through the Drive batch endpoint:
+    batch_size files.get calls per HTTP request, max_workers requests in
+    flight. Sub-requests that were throttled or hit a server error are
+    regrouped and retried with backoff, the rest of their batch is not sent
+    again. Returns (found {id: meta}, failed {id: error}).
+    """
+    pending = list(dict.fromkeys(ids))
+    found, failed = {}, {}
+    backoff = INITIAL_BACKOFF
+    with Progress() as progress:
+        task = progress.add_task("[cyan]Fetching metadata...", total=len(pending))
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            for attempt in range(1, MAX_RETRIES + 1):
+                chunks = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+                futures = {ex.submit(_batch_get, auth, chunk, fields): chunk for chunk in chunks}
+                pending = []
+                for fut in as_completed(futures):
+                    try:
+                        got, retry, errors = fut.result()
+                    except Exception as e:
+                        got, retry, errors = {}, [], {file_id: str(e) for file_id in futures[fut]}
+                    found.update(got)
+                    failed.update(errors)
+                    pending += retry
+                    progress.advance(task, len(got) + len(errors))
+                if not pending:
+                    break
+                if attempt == MAX_RETRIES:
+                    failed.update({file_id: 'max retries exceeded' for file_id in pending})
+                    break
+                wait = backoff + random.uniform(0, 0.5)
+                progress.console.print(f"[Retry {attempt}] {len(pending)} sub-requests to retry, waiting {wait:.1f}s")
+                time.sleep(wait)
+                backoff *= 2
+    return found, failed
+
+
+def refresh_metadata(auth, records, fields=FILE_FIELDS, **kwargs):
+    """
+    Update file-meta records (e.g. from list_files or a saved listing) in
+    place with fresh metadata, keeping local keys such as 'path'.
+    Returns {id: error} for the records that could not be refreshed.
+    """
+    found, failed = fetch_metadata(auth, [r['id'] for r in records], fields, **kwargs)
+    for record in records:
+        if record['id'] in found:
+            record.update(found[record['id']])
+    return failed
+
+
+def read_ids(path):
+    """
+    File IDs from a listing: the 'id' (or 'ID') column of a CSV, the id
+    column of a Parquet file or dataset, otherwise one ID per line.
+    """
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return pq.read_table(path, columns=['id']).column('id').to_pylist()
+    with open(path, 'r', newline='', encoding='utf-8') as fh:
+        if path.endswith('.csv'):
+            reader = csv.DictReader(fh)
+            column = 'id' if 'id' in reader.fieldnames else 'ID'
+            return [row[column] for row in reader if row[column]]
+        return [line.strip() for line in fh if line.strip()]
@@ -0,0 +1,130 @@
+# pipeline.py
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait
+
+from rich.progress import Progress
+
+DOWNLOAD_WORKERS = 4
+CONVERT_WORKERS = os.cpu_count() or 4
+CONVERT_POOLS = {'process': ProcessPoolExecutor, 'thread': ThreadPoolExecutor}
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _done(item, out):
+    res = {'id': item['id'], 'name': item['name'], 'output': out, 'success': True, 'error': None}
+    # converters may return a dict with the output path plus extra fields
+    if isinstance(out, dict):
+        res.update(out)
+    return res
+
+
+def run_two_stage(items, fetch, convert, download_workers=DOWNLOAD_WORKERS,
+                  convert_workers=CONVERT_WORKERS, queue_size=None, keep_inputs=False,
+                  convert_executor='process', on_result=None):
+    """
+    Run fetch(item) -> local path in a thread pool and convert(path) -> output
+    in a process pool sized to the CPU count.
+
+    At most queue_size fetched files wait for conversion at any time; download
+    threads block beyond that, so a slow conversion stage throttles the
+    network instead of filling the disk. Each stage has its own progress bar.
+    Returns one result dict per item, in completion order.
+
+    Use convert_executor='thread' when convert() only waits on a subprocess
+    (e.g. ffmpeg): the child processes already run in parallel.
+    on_result(item, result) is called as soon as each item finishes, so
+    progress survives a crash part-way through the run.
+    """
+    items = list(items)
+    queue_size = queue_size or convert_workers * 2
+    slots = threading.BoundedSemaphore(queue_size)
+    results = []
+    lock = threading.Lock()
+
+    def finish(item, res):
+        with lock:
+            results.append(res)
+            if on_result:
+                on_result(item, res)
+
+    def fetch_one(item):
+        slots.acquire()
+        try:
+            return fetch(item)
+        except BaseException:
+            slots.release()
+            raise
+
+    with Progress() as progress:
+        dl_task = progress.add_task("[cyan]Downloading...", total=len(items))
+        cv_task = progress.add_task("[green]Converting...", total=len(items))
+
+        with ThreadPoolExecutor(max_workers=download_workers) as dl, \
+                CONVERT_POOLS[convert_executor](max_workers=convert_workers) as cv:
+
+            def converted(fut, item, path):
+                # runs on the pool's worker/management thread
+                slots.release()
+                if not keep_inputs:
+                    _remove(path)
+                try:
+                    res = _done(item, fut.result())
+                except Exception as e:
+                    res = {'id': item['id'], 'name': item['name'], 'output': None, 'success': False, 'error': str(e)}
+                    progress.console.print(f"[!] Convert failed: {item['name']} -> {e}")
+                finish(item, res)
+                progress.advance(cv_task)
+
+            dl_futures = {dl.submit(fetch_one, item): item for item in items}
+            cv_futures = []
+            for fut in as_completed(dl_futures):
+                item = dl_futures[fut]
+                progress.advance(dl_task)
+                try:
+                    path = fut.result()
+                except Exception as e:
+                    progress.console.print(f"[!] Download failed: {item['name']} -> {e}")
+                    finish(item, {'id': item['id'], 'name': item['name'], 'output': None, 'success': False, 'error': str(e)})
+                    progress.advance(cv_task)
+                    continue
+                cf = cv.submit(convert, path)
+                cf.add_done_callback(lambda f, item=item, path=path: converted(f, item, path))
+                cv_futures.append(cf)
+            wait(cv_futures)
+
+    return results
+
+
+def run_streaming(items, job, workers=DOWNLOAD_WORKERS, on_result=None):
+    """
+    Single-stage variant for jobs that download and convert at once, e.g. a
+    Drive stream piped into an ffmpeg subprocess. The threads only shuffle
+    bytes; the decoding runs in the child processes.
+    on_result(item, result) is called as each item finishes.
+    Returns one result dict per item, in completion order.
+    """
+    items = list(items)
+    results = []
+    with Progress() as progress:
+        task = progress.add_task("[cyan]Streaming...", total=len(items))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = {ex.submit(job, item): item for item in items}
+            for fut in as_completed(futures):
+                item = futures[fut]
+                try:
+                    res = _done(item, fut.result())
+                except Exception as e:
+                    res = {'id': item['id'], 'name': item['name'], 'output': None, 'success': False, 'error': str(e)}
+                    progress.console.print(f"[!] Failed: {item['name']} -> {e}")
+                results.append(res)
+                if on_result:
+                    on_result(item, res)
+                progress.advance(task)
+    return results
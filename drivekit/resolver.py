@@ -0,0 +1,165 @@
+# resolver.py
+import os
+import time
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from drivekit.download import with_retries
+from drivekit.listing import FOLDER_MIME, LIST_WORKERS, list_children
+from drivekit.service import thread_service
+
+CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'drivekit', 'paths.sqlite')
+CACHE_TTL = 24 * 3600   # seconds a cached (parent, name) -> id entry is trusted
+NAMES_PER_QUERY = 40    # wanted names OR-ed into one query; more and the folder is listed whole
+
+
+class PathCache:
+    """
+    SQLite map of (parent_id, name) -> (id, mimeType), kept across runs in
+    ~/.cache/drivekit/paths.sqlite. Entries older than ttl seconds are
+    treated as missing and fetched again; ttl=0 ignores the cache for
+    lookups but still refreshes it. Safe to share between threads.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS children (
+                parent_id  TEXT NOT NULL,
+                name       TEXT NOT NULL,
+                id         TEXT NOT NULL,
+                mime_type  TEXT,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (parent_id, name)
+            )''')
+        self.conn.commit()
+
+    def get_many(self, pairs):
+        """{(parent_id, name): (id, mimeType)} for the pairs with a fresh entry."""
+        if not self.ttl:
+            return {}
+        oldest = time.time() - self.ttl
+        found = {}
+        with self._lock:
+            for parent_id, name in pairs:
+                row = self.conn.execute(
+                    'SELECT id, mime_type FROM children WHERE parent_id = ? AND name = ? AND fetched_at >= ?',
+                    (parent_id, name, oldest)).fetchone()
+                if row:
+                    found[(parent_id, name)] = row
+        return found
+
+    def put_many(self, rows):
+        """Store (parent_id, name, id, mimeType) rows fetched just now."""
+        now = time.time()
+        with self._lock:
+            self.conn.executemany('INSERT OR REPLACE INTO children VALUES (?, ?, ?, ?, ?)',
+                                  [(*row, now) for row in rows])
+            self.conn.commit()
+
+    def invalidate(self, parent_id=None):
+        """Drop the entries below parent_id, or every entry."""
+        with self._lock:
+            if parent_id is None:
+                self.conn.execute('DELETE FROM children')
+            else:
+                self.conn.execute('DELETE FROM children WHERE parent_id = ?', (parent_id,))
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def split_path(path):
+    """'A000053/sub/file.pdf' -> ['A000053', 'sub', 'file.pdf']; empty parts and '.' are dropped."""
+    return [part for part in path.replace(os.sep, '/').split('/') if part not in ('', '.')]
+
+
+def _quote(name):
+    return name.replace('\\', '\\\\').replace("'", "\\'")
+
+
+def _lookup(auth, parent_id, names):
+    """
+    (parent_id, name, id, mimeType) for the children of parent_id called
+    one of names: a single name query for a few names, the whole folder
+    (every child cached) for many. With duplicate names the first one wins.
+    """
+    service = thread_service(auth)
+    if len(names) > NAMES_PER_QUERY:
+        items = list_children(service, parent_id, fields='id, name, mimeType')
+    else:
+        query = ' or '.join(f"name = '{_quote(name)}'" for name in names)
+        items = [f for f in list_children(service, parent_id, query, fields='id, name, mimeType')
+                 if f['name'] in names]
+    rows = {}
+    for f in items:
+        rows.setdefault(f['name'], (parent_id, f['name'], f['id'], f.get('mimeType')))
+    return list(rows.values())
+
+
+def resolve_paths(auth, paths, root='root', cache=None, max_workers=LIST_WORKERS):
+    """
+    Drive IDs for many slash-separated paths below the folder root ('root'
+    is My Drive). Paths are walked one level at a time: every (parent, name)
+    at that depth is looked up in the cache first, and the misses cost one
+    files.list per parent, run concurrently, so paths sharing folders share
+    the calls. Returns {path: id}, None for paths that do not exist.
+    """
+    own_cache = cache is None
+    cache = cache or PathCache()
+    parts = {path: split_path(path) for path in dict.fromkeys(paths)}
+    current = {path: root for path in parts}
+    result = {}
+    depth = 0
+    try:
+        while current:
+            wanted = {}
+            for path, parent_id in current.items():
+                if depth == len(parts[path]):
+                    result[path] = parent_id
+                else:
+                    wanted[path] = (parent_id, parts[path][depth])
+            if not wanted:
+                break
+            hits = cache.get_many(set(wanted.values()))
+            missing = {}
+            for parent_id, name in set(wanted.values()) - hits.keys():
+                missing.setdefault(parent_id, set()).add(name)
+            if missing:
+                def lookup(item):
+                    parent_id, names = item
+                    return with_retries(lambda: _lookup(auth, parent_id, names), auth, f"resolve in {parent_id}")
+
+                with ThreadPoolExecutor(max_workers=max_workers) as ex:
+                    for rows in ex.map(lookup, missing.items()):
+                        cache.put_many(rows)
+                        hits.update({(parent_id, name): (file_id, mime) for parent_id, name, file_id, mime in rows})
+            current = {}
+            for path, pair in wanted.items():
+                hit = hits.get(pair)
+                if hit is None or (depth + 1 < len(parts[path]) and hit[1] != FOLDER_MIME):
+                    result[path] = None
+                else:
+                    current[path] = hit[0]
+            depth += 1
+    finally:
+        if own_cache:
+            cache.close()
+    return {path: result[path] for path in parts}
+
+
+def resolve_path(auth, path, root='root', cache=None):
+    """Drive ID of one path below root; FileNotFoundError if any part is missing."""
+    file_id = resolve_paths(auth, [path], root, cache)[path]
+    if file_id is None:
+        raise FileNotFoundError(f"{path}: not found on Drive")
+    return file_id
@@ -0,0 +1 @@
+"""S3 bulk copy tools driven by `aws s3 cp` manifest files."""
@@ -0,0 +1,207 @@
+# copy.py
+import os
+import time
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from rich.progress import Progress
+
+COPY_WORKERS = 64                 # S3 calls are latency bound; one pooled client serves them all
+RANGE_SIZE = 8 * 1024 * 1024      # bytes per ranged GET for local destinations
+READ_SIZE = 1024 * 1024
+MULTIPART_THRESHOLD = 256 * 1024 * 1024   # larger objects are copied in parts
+PART_SIZE = 64 * 1024 * 1024
+PART_WORKERS = 16                         # UploadPartCopy calls in flight, across all objects
+MAX_PARTS = 10000                         # S3 limit per multipart upload
+MAX_RETRIES = 5
+INITIAL_BACKOFF = 0.5
+# carried over from the source by CopyObject, set explicitly on multipart copies
+COPIED_HEADERS = ('ContentType', 'ContentEncoding', 'ContentDisposition', 'CacheControl', 'ContentLanguage')
+
+
+def make_client(max_workers=COPY_WORKERS, endpoint_url=None, profile=None, region=None):
+    """
+    One S3 client for every thread (boto3 clients are thread-safe). Its
+    connection pool matches the worker count so TLS connections are reused,
+    and botocore retries throttling and 5xx responses with adaptive backoff.
+    endpoint_url points it at MinIO or a moto server.
+    """
+    import boto3
+    from botocore.config import Config
+
+    session = boto3.session.Session(profile_name=profile, region_name=region)
+    config = Config(max_pool_connections=max_workers,
+                    retries={'max_attempts': MAX_RETRIES, 'mode': 'adaptive'})
+    return session.client('s3', endpoint_url=endpoint_url, config=config)
+
+
+def with_retries(func, attempts=MAX_RETRIES):
+    """
+    Retry func on dropped connections and truncated bodies, which botocore
+    does not retry once a response has started streaming. S3 error
+    responses (ClientError) are raised at once; botocore already retried them.
+    """
+    from botocore.exceptions import BotoCoreError
+
+    delay = INITIAL_BACKOFF
+    for attempt in range(attempts):
+        try:
+            return func()
+        except (BotoCoreError, OSError):
+            if attempt == attempts - 1:
+                raise
+            time.sleep(delay)
+            delay *= 2
+
+
+def copy_object(client, job, parts=None, threshold=MULTIPART_THRESHOLD, part_size=PART_SIZE):
+    """
+    Server-side copy; the bytes never leave S3. Objects above threshold (and
+    everything over CopyObject's 5 GB limit) go through multipart_copy on
+    the parts executor. The size comes from job['size'] when known,
+    otherwise from a HEAD. Returns the byte count.
+    """
+    source = {'Bucket': job['src_bucket'], 'Key': job['src_key']}
+    if parts is None:
+        client.copy_object(CopySource=source, Bucket=job['dest_bucket'], Key=job['dest_key'])
+        return job.get('size')
+    head = None
+    size = job.get('size')
+    if size is None:
+        head = client.head_object(**source)
+        size = head['ContentLength']
+    if size <= threshold:
+        client.copy_object(CopySource=source, Bucket=job['dest_bucket'], Key=job['dest_key'])
+        return size
+    if head is None:
+        head = client.head_object(**source)
+    return multipart_copy(client, job, size, parts, part_size, object_headers(head))
+
+
+def object_headers(head):
+    """User metadata and the headers CopyObject carries over, from a HEAD response."""
+    headers = {name: head[name] for name in COPIED_HEADERS if head.get(name)}
+    headers['Metadata'] = head.get('Metadata', {})
+    return headers
+
+
+def multipart_copy(client, job, size, executor, part_size=PART_SIZE, headers=None):
+    """
+    Copy one object as concurrent UploadPartCopy calls over byte ranges, so
+    a large copy runs as many parallel streams inside S3. headers (see
+    object_headers) go on the new object, which a part copy does not carry
+    over. The upload is aborted if any part fails, leaving no orphaned
+    parts behind.
+    """
+    part_size = max(part_size, -(-size // MAX_PARTS))
+    bucket, key = job['dest_bucket'], job['dest_key']
+    source = {'Bucket': job['src_bucket'], 'Key': job['src_key']}
+    upload_id = client.create_multipart_upload(Bucket=bucket, Key=key, **(headers or {}))['UploadId']
+
+    def copy_part(number, first, last):
+        resp = client.upload_part_copy(Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=number,
+                                       CopySource=source, CopySourceRange=f"bytes={first}-{last}")
+        return {'PartNumber': number, 'ETag': resp['CopyPartResult']['ETag']}
+
+    futures = [executor.submit(with_retries, partial(copy_part, n, first, min(first + part_size, size) - 1))
+               for n, first in enumerate(range(0, size, part_size), 1)]
+    try:
+        done = [f.result() for f in futures]
+        client.complete_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id,
+                                         MultipartUpload={'Parts': done})
+    except BaseException:
+        for f in futures:
+            f.cancel()
+        client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
+    return size
+
+
+def download_object(client, bucket, key, path, range_size=RANGE_SIZE):
+    """
+    Fetch an object with consecutive ranged GETs into path ('.part' until
+    done). A failed range is retried on its own instead of restarting the
+    file. The first response's Content-Range gives the size, so no HEAD is
+    needed. Returns the byte count.
+    """
+    from botocore.exceptions import ClientError
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = path + '.part'
+    offset, total = 0, None
+    try:
+        with open(tmp, 'wb') as fh:
+            while total is None or offset < total:
+                start = offset
+
+                def get_range():
+                    fh.seek(start)
+                    fh.truncate()
+                    resp = client.get_object(Bucket=bucket, Key=key,
+                                             Range=f"bytes={start}-{start + range_size - 1}")
+                    for chunk in resp['Body'].iter_chunks(READ_SIZE):
+                        fh.write(chunk)
+                    return resp
+
+                try:
+                    resp = with_retries(get_range)
+                except ClientError as e:
+                    if e.response.get('Error', {}).get('Code') == 'InvalidRange' and start == 0:
+                        total = 0   # empty object
+                        break
+                    raise
+                offset = fh.tell()
+                if total is None:
+                    content_range = resp.get('ContentRange')
+                    total = int(content_range.rsplit('/', 1)[1]) if content_range else offset
+                if offset == start:
+                    raise IOError(f"s3://{bucket}/{key}: empty range at {start} of {total}")
+    except BaseException:
+        os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    return total
+
+
+def run_job(client, job, base_dir='.', **copy_options):
+    if 'dest_bucket' in job:
+        return copy_object(client, job, **copy_options)
+    return download_object(client, job['src_bucket'], job['src_key'],
+                           os.path.join(base_dir, job['dest_path']))
+
+
+def copy_jobs(jobs, client=None, max_workers=COPY_WORKERS, base_dir='.', on_result=None,
+              multipart_threshold=MULTIPART_THRESHOLD, part_size=PART_SIZE, part_workers=PART_WORKERS):
+    """
+    Run copy jobs (see drivekit.s3.manifest) over a thread pool sharing one
+    client. Parts of large bucket-to-bucket copies run on a separate pool of
+    part_workers threads, so a few big objects cannot starve (or deadlock)
+    the per-object workers; part_workers=0 turns multipart copy off.
+    Returns one result dict per job: src, dest, bytes, success, error.
+    """
+    jobs = list(jobs)
+    client = client or make_client(max_workers + part_workers)
+    results = []
+    with Progress() as progress, \
+            ThreadPoolExecutor(max_workers=max(1, part_workers)) as parts:
+        task = progress.add_task("[cyan]Copying...", total=len(jobs))
+        options = {'parts': parts if part_workers else None,
+                   'threshold': multipart_threshold, 'part_size': part_size}
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            futures = {ex.submit(run_job, client, job, base_dir, **options): job for job in jobs}
+            for fut in as_completed(futures):
+                job = futures[fut]
+                try:
+                    res = {'src': job['src'], 'dest': job['dest'], 'bytes': fut.result(),
+                           'success': True, 'error': None}
+                except Exception as e:
+                    res = {'src': job['src'], 'dest': job['dest'], 'bytes': None,
+                           'success': False, 'error': str(e)}
+                    progress.console.print(f"[!] Failed: {job['src']} -> {e}")
+                results.append(res)
+                if on_result:
+                    on_result(job, res)
+                progress.advance(task)
+    return results
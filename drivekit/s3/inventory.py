@@ -0,0 +1,248 @@
+# inventory.py
+import os
+import csv
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from drivekit.s3.manifest import job_target
+
+KEYS_PER_LIST = 10          # widen prefixes until each listing covers this many wanted keys on average
+LIST_WORKERS = 32           # concurrent ListObjectsV2 streams
+PARTITIONS_PER_WORKER = 4   # split the keyspace until every worker has this many prefixes to list
+MAX_DEPTH = 6               # '/' levels walked while partitioning (job/<job>/task/<task>/assets/<uuid>/)
+BATCH_ROWS = 100000         # inventory rows per Parquet row group
+
+
+def list_prefix(client, bucket, prefix):
+    """Yield key, size, etag and last_modified for every object under prefix (ListObjectsV2, 1000 per page)."""
+    paginator = client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get('Contents', []):
+            yield _row(obj)
+
+
+def _row(obj):
+    return {'key': obj['Key'], 'size': obj['Size'], 'etag': obj['ETag'].strip('"'),
+            'last_modified': obj['LastModified']}
+
+
+def list_level(client, bucket, prefix):
+    """One delimiter listing: (sub-prefixes, objects directly under prefix)."""
+    subs, objs = [], []
+    paginator = client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix, Delimiter='/'):
+        subs += [p['Prefix'] for p in page.get('CommonPrefixes', [])]
+        objs += [_row(o) for o in page.get('Contents', [])]
+    return subs, objs
+
+
+def partition_keyspace(client, bucket, prefix, target, executor, max_depth=MAX_DEPTH):
+    """
+    Split prefix into at least target disjoint prefixes by walking '/' levels
+    (job/ -> job/<job>/ -> .../task/<task>/ -> .../assets/<uuid>/), the
+    prefixes of each level listed concurrently. Objects met on the way are
+    returned too, so partitions + loose objects cover the whole prefix.
+    Returns (partitions, loose).
+    """
+    partitions, loose = [prefix], []
+    for _ in range(max_depth):
+        if len(partitions) >= target:
+            break
+        deeper = []
+        for subs, objs in executor.map(lambda p: list_level(client, bucket, p), partitions):
+            deeper += subs
+            loose += objs
+        partitions = deeper
+        if not partitions:
+            break
+    return partitions, loose
+
+
+def inventory_prefix(client, bucket, prefix, on_rows, max_workers=LIST_WORKERS, batch=10000):
+    """
+    List everything under prefix as concurrent ListObjectsV2 streams over
+    partition_keyspace() partitions. on_rows(rows) receives batches of
+    inventory rows (key, size, etag, last_modified) as they arrive, from
+    several threads, never more than one at a time. Returns the row count.
+    """
+    lock = threading.Lock()
+    count = 0
+
+    def emit(rows):
+        nonlocal count
+        with lock:
+            on_rows(rows)
+            count += len(rows)
+
+    def list_partition(p):
+        rows = []
+        for row in list_prefix(client, bucket, p):
+            rows.append(row)
+            if len(rows) >= batch:
+                emit(rows)
+                rows = []
+        if rows:
+            emit(rows)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        partitions, loose = partition_keyspace(client, bucket, prefix, max_workers * PARTITIONS_PER_WORKER, ex)
+        if loose:
+            emit(loose)
+        for fut in as_completed([ex.submit(list_partition, p) for p in partitions]):
+            fut.result()
+    return count
+
+
+class InventoryWriter:
+    """
+    Inventory rows to Parquet (zstd, BATCH_ROWS per row group; needs pyarrow)
+    or, for a .csv path, CSV. Memory stays at one row group.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = []
+        self.writer = None
+        if path.endswith('.csv'):
+            self.fh = open(path, 'w', newline='', encoding='utf-8')
+            self.csv = csv.DictWriter(self.fh, fieldnames=['key', 'size', 'etag', 'last_modified'])
+            self.csv.writeheader()
+            return
+        self.csv = None
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise RuntimeError("Parquet inventories need pyarrow: pip install pyarrow (or write .csv)")
+        self.schema = pa.schema([('key', pa.string()), ('size', pa.int64()), ('etag', pa.string()),
+                                 ('last_modified', pa.timestamp('ms', tz='UTC'))])
+
+    def write(self, rows):
+        if self.csv:
+            self.csv.writerows(rows)
+            return
+        self.rows += rows
+        if len(self.rows) >= BATCH_ROWS:
+            self._flush()
+
+    def _flush(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self.rows:
+            return
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, self.schema, compression='zstd')
+        self.writer.write_table(pa.Table.from_pylist(self.rows, schema=self.schema))
+        self.rows = []
+
+    def close(self):
+        if self.csv:
+            self.fh.close()
+            return
+        self._flush()
+        if self.writer is not None:
+            self.writer.close()
+        else:
+            import pyarrow.parquet as pq
+            pq.write_table(self.schema.empty_table(), self.path)
+
+
+def covering_prefixes(keys, keys_per_list=KEYS_PER_LIST):
+    """
+    A few 'directory' prefixes whose listings contain all keys. Starts at
+    each key's directory and moves up a level only while the listings would
+    average fewer than keys_per_list keys, so one-folder-per-asset layouts
+    (.../assets/<uuid>/x.wav) are listed per assets/ folder instead of per
+    object, without climbing to a bucket-wide listing.
+    """
+    keys = set(keys)
+    prefixes = {k.rsplit('/', 1)[0] + '/' if '/' in k else '' for k in keys}
+    while len(prefixes) * keys_per_list > len(keys):
+        parents = {p[:-1].rsplit('/', 1)[0] + '/' if '/' in p[:-1] else '' for p in prefixes}
+        if len(parents) == len(prefixes):
+            break   # going up would not merge any listings
+        prefixes = parents
+    # a prefix inside another would be listed twice
+    return sorted(p for p in prefixes if not any(q != p and p.startswith(q) for q in prefixes))
+
+
+def inventory(client, bucket, keys, max_workers=LIST_WORKERS):
+    """{key: object} for the given keys that exist, from a handful of concurrent paginated listings."""
+    wanted = set(keys)
+    found = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        for objs in ex.map(lambda p: list(list_prefix(client, bucket, p)), covering_prefixes(wanted)):
+            found.update((obj['key'], obj) for obj in objs if obj['key'] in wanted)
+    return found
+
+
+def _by_bucket(pairs):
+    grouped = defaultdict(list)
+    for bucket, key in pairs:
+        grouped[bucket].append(key)
+    return grouped
+
+
+def same_object(src, dst):
+    """
+    Size and ETag match. An object we copied in parts has a multipart ETag
+    ('...-N') that cannot equal a single-part source's; it counts as the same
+    when the size matches and it was written after the source.
+    """
+    if src['size'] != dst['size']:
+        return False
+    if src['etag'] == dst['etag']:
+        return True
+    return '-' in dst['etag'] and dst['last_modified'] >= src['last_modified']
+
+
+def source_objects(client, jobs):
+    """{(bucket, key): object} for every job's source that exists."""
+    sources = {}
+    for bucket, keys in _by_bucket((j['src_bucket'], j['src_key']) for j in jobs).items():
+        sources.update({(bucket, k): obj for k, obj in inventory(client, bucket, keys).items()})
+    return sources
+
+
+def verify_entries(client, jobs, base_dir='.'):
+    """drivekit.verify entries for the local destinations of jobs, with the source's size and ETag."""
+    sources = source_objects(client, jobs)
+    entries = []
+    for job in jobs:
+        if 'dest_path' not in job:
+            continue
+        src = sources.get((job['src_bucket'], job['src_key']), {})
+        entries.append({'path': os.path.join(base_dir, job['dest_path']), 'source': job['src'],
+                        'size': src.get('size'), 'etag': src.get('etag')})
+    return entries
+
+
+def plan_copies(client, jobs, base_dir='.'):
+    """
+    Inventory sources and destinations with ListObjectsV2 (no HEAD per key),
+    fill in each job's source size/etag and drop jobs whose destination
+    already holds the same object. Local destinations are compared by size.
+    Returns (todo, skipped).
+    """
+    sources = source_objects(client, jobs)
+    targets = {}
+    remote = [job_target(j) for j in jobs if 'dest_bucket' in j]
+    for bucket, keys in _by_bucket(remote).items():
+        targets.update({(bucket, k): obj for k, obj in inventory(client, bucket, keys).items()})
+
+    todo, skipped = [], []
+    for job in jobs:
+        src = sources.get((job['src_bucket'], job['src_key']))
+        if src is None:
+            todo.append(job)   # missing source: let the copy report it
+            continue
+        job['size'], job['etag'] = src['size'], src['etag']
+        if 'dest_bucket' in job:
+            dst = targets.get(job_target(job))
+            done = dst is not None and same_object(src, dst)
+        else:
+            path = os.path.join(base_dir, job['dest_path'])
+            done = os.path.isfile(path) and os.path.getsize(path) == src['size']
+        (skipped if done else todo).append(job)
+    return todo, skipped
@@ -0,0 +1,171 @@
+# manifest.py
+import os
+import shlex
+
+
+def parse_s3_url(url):
+    """'s3://bucket/key' -> (bucket, key)."""
+    if not url.startswith('s3://'):
+        raise ValueError(f"not an s3:// URL: {url}")
+    bucket, _, key = url[5:].partition('/')
+    return bucket, key
+
+
+def _destination(dest):
+    """DEST -> (bucket or None for local, key or path, whether the source name is appended)."""
+    if dest.startswith('s3://'):
+        bucket, key = parse_s3_url(dest)
+        return bucket, key, not key or key.endswith('/')
+    return None, dest, dest.endswith(('/', os.sep))
+
+
+def _target(destination, name):
+    bucket, base, into = destination
+    if bucket is None:
+        return {'dest_path': os.path.join(base, name) if into else base}
+    return {'dest_bucket': bucket, 'dest_key': base + name if into else base}
+
+
+def parse_line(line):
+    """
+    One `aws s3 cp SRC DEST` line -> copy job, or None for blank and # lines.
+    As with the aws CLI, a DEST ending in '/' means "into this prefix or
+    directory" and the source file name is appended.
+    The job has src/dest (the original strings), src_bucket/src_key, and
+    either dest_bucket/dest_key or dest_path (local, relative as written).
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    args = shlex.split(line)
+    if args[:3] != ['aws', 's3', 'cp'] or len(args) < 5:
+        raise ValueError(f"not an 'aws s3 cp SRC DEST' line: {line}")
+    src, dest = args[3], args[4]
+    bucket, key = parse_s3_url(src)
+    job = {'src': src, 'dest': dest, 'src_bucket': bucket, 'src_key': key}
+    job.update(_target(_destination(dest), key.rsplit('/', 1)[-1]))
+    return job
+
+
+def read_manifest(path):
+    """Yield the copy jobs of one manifest file (text, or .parquet from write_columnar)."""
+    if path.endswith('.parquet'):
+        yield from jobs_from_table(read_columnar(path))
+        return
+    with open(path, 'r', encoding='utf-8') as fh:
+        for lineno, line in enumerate(fh, 1):
+            try:
+                job = parse_line(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{lineno}: {e}")
+            if job:
+                yield job
+
+
+def read_manifests(paths):
+    return [job for path in paths for job in read_manifest(path)]
+
+
+def job_target(job):
+    return (job['dest_bucket'], job['dest_key']) if 'dest_bucket' in job else (None, job['dest_path'])
+
+
+def dedupe_jobs(jobs):
+    """
+    Drop repeated lines, within a manifest or across overlapping ones.
+    Jobs are keyed by destination; when two different sources target the
+    same destination the later line wins, as it would running them in order.
+    Returns (jobs, duplicates, conflicts).
+    """
+    unique = {}
+    duplicates = conflicts = 0
+    for job in jobs:
+        target = job_target(job)
+        seen = unique.get(target)
+        if seen is not None:
+            if seen['src'] == job['src']:
+                duplicates += 1
+                continue
+            conflicts += 1
+            del unique[target]
+        unique[target] = job
+    return list(unique.values()), duplicates, conflicts
+
+
+def split_key(key):
+    """
+    'tenant/.../assets/<uuid>/A000672_t1_8.wav' -> (prefix, uuid, filename),
+    prefix ending in '/'. uuid is None for keys without a directory.
+    """
+    parts = key.rsplit('/', 2)
+    if len(parts) == 1:
+        return '', None, key
+    if len(parts) == 2:
+        return '', parts[0], parts[1]
+    return parts[0] + '/', parts[1], parts[2]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        raise RuntimeError("columnar manifests need pyarrow: pip install pyarrow")
+
+
+def write_columnar(jobs, path):
+    """
+    Save copy jobs as Parquet: src_bucket, src_prefix and dest are
+    dictionary-encoded (a few distinct values for thousands of lines), uuid
+    and filename are plain strings, all zstd-compressed.
+    """
+    pa = _pyarrow()
+    cols = {'src_bucket': [], 'src_prefix': [], 'uuid': [], 'filename': [], 'dest': []}
+    for job in jobs:
+        prefix, uuid, filename = split_key(job['src_key'])
+        cols['src_bucket'].append(job['src_bucket'])
+        cols['src_prefix'].append(prefix)
+        cols['uuid'].append(uuid)
+        cols['filename'].append(filename)
+        cols['dest'].append(job['dest'])
+    table = pa.table({name: pa.array(values, pa.string()) for name, values in cols.items()})
+    for name in ('src_bucket', 'src_prefix', 'dest'):
+        table = table.set_column(table.schema.get_field_index(name), name, table[name].dictionary_encode())
+    pa.parquet.write_table(table, path, compression='zstd')
+    return path
+
+
+def read_columnar(path):
+    """The manifest as a pyarrow Table, with a src_key column rebuilt from prefix/uuid/filename."""
+    pa = _pyarrow()
+    import pyarrow.compute as pc
+
+    table = pa.parquet.read_table(path)
+    prefix = table['src_prefix'].cast(pa.string())
+    uuid = pc.if_else(pc.is_null(table['uuid']), '', pc.binary_join_element_wise(table['uuid'], '', '/'))
+    src_key = pc.binary_join_element_wise(prefix, uuid, table['filename'], '')
+    return table.append_column('src_key', src_key)
+
+
+def jobs_from_table(table):
+    """Copy jobs from read_columnar(); each distinct dest is parsed once."""
+    buckets = table['src_bucket'].to_pylist()
+    keys = table['src_key'].to_pylist()
+    dests = table['dest'].to_pylist()
+    filenames = table['filename'].to_pylist()
+    destinations = {d: _destination(d) for d in table['dest'].unique().to_pylist()}
+    jobs = []
+    for bucket, key, name, dest in zip(buckets, keys, filenames, dests):
+        job = {'src': f"s3://{bucket}/{key}", 'dest': dest, 'src_bucket': bucket, 'src_key': key}
+        job.update(_target(destinations[dest], name))
+        jobs.append(job)
+    return jobs
+
+
+def write_text(jobs, path):
+    """Write copy jobs back as `aws s3 cp "SRC" "DEST"` lines."""
+    with open(path, 'w', encoding='utf-8') as fh:
+        for job in jobs:
+            fh.write(f'aws s3 cp "{job["src"]}" "{job["dest"]}"\n')
+    return path
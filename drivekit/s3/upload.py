@@ -0,0 +1,147 @@
+# upload.py
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from rich.progress import Progress
+
+from drivekit import download
+from drivekit.download import EXPORT_MAP, STREAM_CHUNK_SIZE, safe_name, target_name, with_retries
+from drivekit.listing import list_files
+from drivekit.s3 import copy
+from drivekit.service import thread_service
+
+PART_SIZE = 8 * 1024 * 1024   # S3 minimum is 5 MiB (except the last part)
+PARTS_IN_FLIGHT = 4           # per transfer; memory is about (PARTS_IN_FLIGHT + 1) * PART_SIZE
+TRANSFER_WORKERS = 8
+PART_WORKERS = 32             # part uploads in flight across all transfers
+
+
+class MultipartUploadSink:
+    """
+    Writable binary file object that uploads what is written to it as an S3
+    object. Bytes are cut into PART_SIZE parts uploaded concurrently on the
+    parts executor; write() blocks while max_in_flight parts of this
+    transfer are still uploading, so memory stays bounded whatever the file
+    size. Objects smaller than one part are sent with a single PutObject.
+    close() completes the upload and returns (size, md5 hex of the bytes).
+    """
+
+    def __init__(self, client, bucket, key, parts, part_size=PART_SIZE, max_in_flight=PARTS_IN_FLIGHT):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.parts = parts
+        self.part_size = part_size
+        self.buf = bytearray()
+        self.md5 = hashlib.md5()
+        self.size = 0
+        self.upload_id = None
+        self.futures = []
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+
+    def _upload_part(self, number, data):
+        try:
+            resp = copy.with_retries(lambda: self.client.upload_part(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, PartNumber=number, Body=data))
+            return {'PartNumber': number, 'ETag': resp['ETag']}
+        finally:
+            self._slots.release()
+
+    def _submit(self, data):
+        if self.upload_id is None:
+            self.upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=self.key)['UploadId']
+        self._slots.acquire()
+        self.futures.append(self.parts.submit(self._upload_part, len(self.futures) + 1, data))
+
+    def write(self, data):
+        self.md5.update(data)
+        self.size += len(data)
+        self.buf += data
+        while len(self.buf) >= self.part_size:
+            part = bytes(self.buf[:self.part_size])
+            del self.buf[:self.part_size]
+            self._submit(part)
+        return len(data)
+
+    def close(self):
+        if self.upload_id is None:
+            self.client.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self.buf))
+        else:
+            if self.buf:
+                self._submit(bytes(self.buf))
+            done = [f.result() for f in self.futures]
+            self.client.complete_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+                                                  MultipartUpload={'Parts': done})
+        self.buf = bytearray()
+        return self.size, self.md5.hexdigest()
+
+    def abort(self):
+        for f in self.futures:
+            f.cancel()
+        for f in self.futures:
+            if not f.cancelled():
+                f.exception()   # let running parts finish so the abort removes them
+        if self.upload_id is not None:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+        self.buf = bytearray()
+
+
+def object_key(prefix, file_meta):
+    """prefix + the file's Drive folder path + its (export) name."""
+    parts = [p for p in (prefix.rstrip('/'), file_meta.get('path', '')) if p]
+    parts.append(safe_name(target_name(file_meta)))
+    return '/'.join(parts)
+
+
+def transfer_worker(file_meta, auth, client, bucket, prefix, parts):
+    """
+    Stream one Drive file into s3://bucket/<key>. The bytes go from
+    get_media chunks straight into upload parts; nothing touches the disk.
+    The md5 of what was streamed is checked against Drive's md5Checksum
+    before the object is committed; a mismatch aborts and retries it.
+    Returns a result dict like download_worker's, with key and bytes.
+    """
+    name = target_name(file_meta)
+    key = object_key(prefix, file_meta)
+    expected = None if file_meta.get('mimeType') in EXPORT_MAP else file_meta.get('md5Checksum')
+
+    def attempt():
+        sink = MultipartUploadSink(client, bucket, key, parts)
+        try:
+            download.fetch(thread_service(auth), file_meta, sink, chunk_size=STREAM_CHUNK_SIZE)
+            if expected and sink.md5.hexdigest() != expected:
+                raise IOError(f"md5 mismatch: streamed {sink.md5.hexdigest()}, Drive has {expected}")
+            return sink.close()
+        except BaseException:
+            sink.abort()
+            raise
+
+    try:
+        size, md5 = with_retries(attempt, auth, name)
+        return {'id': file_meta['id'], 'name': name, 'key': key, 'md5': md5, 'bytes': size,
+                'success': True, 'error': None}
+    except Exception as e:
+        return {'id': file_meta['id'], 'name': name, 'key': key, 'md5': expected, 'bytes': None,
+                'success': False, 'error': str(e)}
+
+
+def transfer_folder(auth, folder_id, bucket, prefix='', client=None,
+                    max_workers=TRANSFER_WORKERS, part_workers=PART_WORKERS):
+    """Stream every file below folder_id into s3://bucket/prefix, keeping the folder layout."""
+    print("[+] Listing files...")
+    files = list_files(auth, folder_id)
+    print(f"[+] Found {len(files)} files. Using {max_workers} transfers.")
+    client = client or copy.make_client(max_workers + part_workers)
+    failed = []
+    with Progress() as progress, ThreadPoolExecutor(max_workers=part_workers) as parts, \
+            ThreadPoolExecutor(max_workers=max_workers) as ex:
+        task = progress.add_task("Transferring...", total=len(files))
+        futures = [ex.submit(transfer_worker, f, auth, client, bucket, prefix, parts) for f in files]
+        for fut in as_completed(futures):
+            res = fut.result()
+            if not res['success']:
+                failed.append(res)
+                progress.console.print(f"[!] Failed: {res['name']} -> {res['error']}")
+            progress.advance(task)
+    return files, failed
@@ -0,0 +1,101 @@
+# wavstats.py
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from rich.progress import Progress
+
+from drivekit.audio.wav import parse_header
+from drivekit.s3 import copy
+
+HEADER_BYTES = 512          # RIFF + fmt + data headers of a plain WAV
+MAX_HEADER_BYTES = 65536    # give up if LIST/bext chunks push data further than this
+STATS_WORKERS = 64
+SPEAKER_PATTERN = r'^(?P<speaker>[^_/]+)_'   # A000672_t1_8.wav -> A000672
+JOB_PATTERN = r'/job/(?P<job>[^/]+)/'
+
+
+def wav_header_info(client, bucket, key):
+    """
+    Read only the start of a WAV object with Range GETs (512 bytes, more
+    only if extra chunks come before the data) and return its format, data
+    size, duration and object size.
+    """
+    want = HEADER_BYTES
+    while True:
+        resp = copy.with_retries(lambda: client.get_object(Bucket=bucket, Key=key, Range=f"bytes=0-{want - 1}"))
+        head = resp['Body'].read()
+        content_range = resp.get('ContentRange')
+        size = int(content_range.rsplit('/', 1)[1]) if content_range else len(head)
+        parsed = parse_header(head)
+        if parsed is not None or len(head) >= size or want >= MAX_HEADER_BYTES:
+            break
+        want *= 8
+    if parsed is None:
+        raise ValueError(f"s3://{bucket}/{key}: no WAV data chunk in the first {len(head)} bytes")
+    fmt, offset, data_size = parsed
+    if data_size in (0, 0xFFFFFFFF) or offset + data_size > size:
+        data_size = size - offset   # streamed or truncated WAV: the data runs to the end
+    rate = fmt['sample_rate'] * fmt['block_align']
+    return {'sample_rate': fmt['sample_rate'], 'channels': fmt['channels'], 'bits': fmt['bits'],
+            'data_bytes': data_size, 'bytes': size, 'duration': data_size / rate if rate else 0.0}
+
+
+def collect_stats(client, objects, max_workers=STATS_WORKERS, on_result=None):
+    """
+    Header stats for (bucket, key) pairs, fetched concurrently.
+    Returns one dict per object: bucket, key, success, error and the
+    wav_header_info() fields.
+    """
+    objects = list(objects)
+    results = []
+    with Progress() as progress:
+        task = progress.add_task("[cyan]Reading headers...", total=len(objects))
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            futures = {ex.submit(wav_header_info, client, b, k): (b, k) for b, k in objects}
+            for fut in as_completed(futures):
+                bucket, key = futures[fut]
+                try:
+                    res = dict(fut.result(), bucket=bucket, key=key, success=True, error=None)
+                except Exception as e:
+                    res = {'bucket': bucket, 'key': key, 'success': False, 'error': str(e)}
+                    progress.console.print(f"[!] Failed: {key} -> {e}")
+                results.append(res)
+                if on_result:
+                    on_result(res)
+                progress.advance(task)
+    return results
+
+
+def aggregate(results, speaker_pattern=SPEAKER_PATTERN, job_pattern=JOB_PATTERN):
+    """
+    Totals overall, per speaker (from the file name) and per job (from the
+    key path): files, hours and bytes.
+    """
+    speaker_re = re.compile(speaker_pattern)
+    job_re = re.compile(job_pattern)
+    groups = {'speakers': defaultdict(lambda: {'files': 0, 'seconds': 0.0, 'bytes': 0}),
+              'jobs': defaultdict(lambda: {'files': 0, 'seconds': 0.0, 'bytes': 0})}
+    total = {'files': 0, 'seconds': 0.0, 'bytes': 0}
+    for res in results:
+        if not res['success']:
+            continue
+        name = res['key'].rsplit('/', 1)[-1]
+        m = speaker_re.match(name)
+        j = job_re.search('/' + res['key'])
+        for bucket, label in (('speakers', m.group('speaker') if m else '?'),
+                              ('jobs', j.group('job') if j else '?')):
+            row = groups[bucket][label]
+            row['files'] += 1
+            row['seconds'] += res['duration']
+            row['bytes'] += res['bytes']
+        total['files'] += 1
+        total['seconds'] += res['duration']
+        total['bytes'] += res['bytes']
+
+    def hours(row):
+        return {'files': row['files'], 'hours': round(row['seconds'] / 3600, 3), 'bytes': row['bytes']}
+
+    return {'total': hours(total),
+            'speakers': {k: hours(v) for k, v in sorted(groups['speakers'].items())},
+            'jobs': {k: hours(v) for k, v in sorted(groups['jobs'].items())}}
@@ -0,0 +1,30 @@
+# service.py
+import threading
+
+from googleapiclient.discovery import build_from_document
+
+from drivekit.discovery import drive_document
+
+_local = threading.local()
+
+
+def build_service(creds):
+    """Build a Drive v3 service object from the cached discovery document."""
+    return build_from_document(drive_document(), credentials=creds)
+
+
+def thread_service(auth):
+    """
+    Return this thread's Drive service, building it on first use.
+    httplib2 connections are not thread-safe, so every worker gets its own
+    service, but it is reused across files instead of rebuilt per download.
+    The credential manager refreshes its credentials object in place, so the
+    cached service keeps seeing the current token.
+    """
+    services = getattr(_local, 'services', None)
+    if services is None:
+        services = _local.services = {}
+    service = services.get(id(auth))
+    if service is None:
+        service = services[id(auth)] = build_service(auth.get())
+    return service
@@ -0,0 +1,167 @@
+# shards.py
+import io
+import os
+import json
+import time
+import tarfile
+import threading
+from functools import lru_cache
+
+SHARD_SIZE = 1024 * 1024 * 1024  # bytes per shard before rolling over
+MANIFEST = 'shards.json'
+MANIFEST_EVERY = 50  # samples between manifest rewrites inside one shard
+
+
+def sample_key(name):
+    """
+    WebDataset groups members by the part of the name before the first dot,
+    so the key is the file stem with any remaining dots replaced.
+    """
+    stem = os.path.splitext(os.path.basename(name))[0]
+    return stem.replace('.', '_')
+
+
+@lru_cache(maxsize=16)
+def _listed_keys(manifest_path, mtime_ns):
+    with open(manifest_path, 'r', encoding='utf-8') as fh:
+        return {shard['shard']: frozenset(shard['keys']) for shard in json.load(fh)['shards']}
+
+
+def sample_exists(output):
+    """
+    True if '<dir>/<shard>.tar#<key>' is listed in that directory's
+    shards.json: samples written after the last manifest rewrite of a
+    crashed run are not, and are cut from the shard when it is reopened.
+    """
+    path, key = output.rsplit('#', 1)
+    manifest_path = os.path.join(os.path.dirname(path), MANIFEST)
+    try:
+        listed = _listed_keys(manifest_path, os.stat(manifest_path).st_mtime_ns)
+    except OSError:
+        return False
+    return key in listed.get(os.path.basename(path), ()) and os.path.exists(path)
+
+
+class ShardWriter:
+    """
+    Write samples into fixed-size tar shards (shard-000000.tar, ...), each
+    sample being its data file(s) plus a <key>.json metadata sidecar.
+    shards.json lists every shard with its sample count, size and keys, and
+    an existing manifest is continued, so resumed runs append new shards.
+    A shard left open by a crash is cut back to the samples shards.json
+    lists and terminated (or removed if it lists none), so the manifest and
+    the tars always agree. Thread-safe: samples can be written from
+    pipeline callbacks.
+    """
+
+    def __init__(self, out_dir, prefix='shard', max_size=SHARD_SIZE, max_count=None):
+        self.out_dir = out_dir
+        self.prefix = prefix
+        self.max_size = max_size
+        self.max_count = max_count
+        self.manifest_path = os.path.join(out_dir, MANIFEST)
+        self._lock = threading.Lock()
+        self.tar = None
+        self.current = None
+        os.makedirs(out_dir, exist_ok=True)
+        self.shards = []
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as fh:
+                self.shards = json.load(fh)['shards']
+            if not all(shard.get('closed') for shard in self.shards):
+                self.shards = [shard for shard in self.shards if self._repair(shard)]
+                self._write_manifest()
+        self.keys = {k for shard in self.shards for k in shard['keys']}
+
+    def _repair(self, shard):
+        """Make a shard from a crashed run end after its last listed sample; False to drop it."""
+        if shard.get('closed'):
+            return True
+        path = os.path.join(self.out_dir, shard['shard'])
+        if not shard['samples'] or not os.path.exists(path):
+            if os.path.exists(path):
+                os.remove(path)
+            return False
+        with open(path, 'r+b') as fh:
+            fh.truncate(shard['bytes'])
+            fh.seek(shard['bytes'])
+            # end-of-archive blocks, padded to a full record as tarfile does
+            end = shard['bytes'] + 2 * tarfile.BLOCKSIZE
+            fh.write(b'\0' * (end - shard['bytes'] + -end % tarfile.RECORDSIZE))
+        shard['closed'] = True
+        return True
+
+    def _open_next(self):
+        index = len(self.shards)
+        name = f"{self.prefix}-{index:06d}.tar"
+        while os.path.exists(os.path.join(self.out_dir, name)):
+            index += 1
+            name = f"{self.prefix}-{index:06d}.tar"
+        self.current = {'shard': name, 'samples': 0, 'bytes': 0, 'keys': []}
+        self.shards.append(self.current)
+        self.tar = tarfile.open(os.path.join(self.out_dir, name), 'w')
+        self._write_manifest()
+
+    def _close_current(self):
+        if self.tar is not None:
+            self.tar.close()
+            self.tar = None
+            self.current['closed'] = True
+            self._write_manifest()
+
+    def _write_manifest(self):
+        tmp = self.manifest_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump({'shards': self.shards}, fh, indent=1)
+        os.replace(tmp, self.manifest_path)
+
+    def _add(self, member, fileobj, size):
+        info = tarfile.TarInfo(member)
+        info.size = size
+        info.mtime = int(time.time())
+        self.tar.addfile(info, fileobj)
+        # end of the last whole member: where a crashed shard is cut back to
+        self.current['bytes'] = self.tar.offset
+
+    def write(self, key, files, meta):
+        """
+        Add one sample. files maps extension ('wav', 'flac', ...) to a path
+        on disk; meta is stored as <key>.json, so a JSON data file goes in as
+        <key>.json.data instead of colliding with it. A key already used in
+        this shard set gets a _1, _2... suffix. Returns '<shard>#<key>'.
+        """
+        files = {('json.data' if ext.lower() == 'json' else ext): path for ext, path in files.items()}
+        sizes = {ext: os.path.getsize(path) for ext, path in files.items()}
+        meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        with self._lock:
+            base, n = key, 0
+            while key in self.keys:
+                n += 1
+                key = f"{base}_{n}"
+            self.keys.add(key)
+            full = self.current and (
+                self.current['bytes'] + sum(sizes.values()) > self.max_size
+                or (self.max_count and self.current['samples'] >= self.max_count))
+            if self.tar is None or (full and self.current['samples']):
+                self._close_current()
+                self._open_next()
+            for ext, path in files.items():
+                with open(path, 'rb') as fh:
+                    self._add(f"{key}.{ext}", fh, sizes[ext])
+            self._add(f"{key}.json", io.BytesIO(meta_bytes), len(meta_bytes))
+            self.current['samples'] += 1
+            self.current['keys'].append(key)
+            if self.current['samples'] % MANIFEST_EVERY == 0:
+                self.tar.fileobj.flush()
+                self._write_manifest()
+            return f"{os.path.join(self.out_dir, self.current['shard'])}#{key}"
+
+    def close(self):
+        with self._lock:
+            self._close_current()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,248 @@
+# verify.py
+import os
+import csv
+import json
+import zlib
+import hashlib
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB reads per member
+READ_SIZE = 8 * 1024 * 1024  # readinto() buffer for loose files
+MAX_WORKERS = os.cpu_count() or 4
+MIB = 1024 * 1024
+# part sizes (MiB) used by aws-cli/boto3 (8), s3cmd (15), rclone (5), our copy tools (8, 64) and others
+COMMON_PART_SIZES = [8, 16, 5, 10, 15, 32, 50, 64, 100, 128, 256, 512]
+
+
+def md5_manifest_path(zip_name):
+    """Sidecar file written next to the ZIP with the Drive md5 of each member."""
+    return f"{zip_name}.md5.json"
+
+
+def split_ranges(infos, parts):
+    """
+    Split the member list into contiguous (start, stop) ranges of roughly
+    equal compressed size, so each worker reads a similar amount of data.
+    """
+    total = sum(i.compress_size for i in infos) or 1
+    target = total / parts
+    ranges = []
+    start = 0
+    acc = 0
+    for idx, info in enumerate(infos):
+        acc += info.compress_size
+        if acc >= target and len(ranges) < parts - 1:
+            ranges.append((start, idx + 1))
+            start = idx + 1
+            acc = 0
+    if start < len(infos):
+        ranges.append((start, len(infos)))
+    return ranges
+
+
+def verify_range(zip_path, start, stop, expected_md5=None):
+    """
+    Verify members [start, stop) of the archive in this process.
+    The CRC-32 is checked by zipfile itself while the member is read to the end.
+    """
+    expected_md5 = expected_md5 or {}
+    results = []
+    with zipfile.ZipFile(zip_path) as zf:
+        for info in zf.infolist()[start:stop]:
+            if info.is_dir():
+                continue
+            want_md5 = expected_md5.get(info.filename)
+            md5 = hashlib.md5() if want_md5 else None
+            size = 0
+            error = None
+            try:
+                with zf.open(info) as fh:
+                    while True:
+                        chunk = fh.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        size += len(chunk)
+                        if md5:
+                            md5.update(chunk)
+                if size != info.file_size:
+                    error = f"size {size} != {info.file_size}"
+                elif md5 and md5.hexdigest() != want_md5:
+                    error = f"md5 {md5.hexdigest()} != {want_md5}"
+            except (zipfile.BadZipFile, EOFError, OSError, zlib.error) as e:
+                error = str(e)
+            results.append({'name': info.filename, 'size': size, 'ok': error is None, 'error': error})
+    return results
+
+
+def verify_zip(zip_path, check_md5=False, manifest=None, max_workers=MAX_WORKERS):
+    """Verify every member of zip_path in a process pool and return the failures."""
+    from rich.progress import Progress
+
+    expected_md5 = {}
+    if check_md5:
+        manifest = manifest or md5_manifest_path(zip_path)
+        with open(manifest, 'r', encoding='utf-8') as fh:
+            expected_md5 = json.load(fh)
+
+    with zipfile.ZipFile(zip_path) as zf:
+        infos = zf.infolist()
+    if not infos:
+        return [], 0
+
+    # a few ranges per worker keeps the pool busy when member sizes are uneven
+    ranges = split_ranges(infos, max(1, max_workers * 4))
+    failed = []
+    checked = 0
+
+    with Progress() as progress:
+        task = progress.add_task("Verifying...", total=len(infos))
+        with ProcessPoolExecutor(max_workers=max_workers) as ex:
+            futures = {}
+            for start, stop in ranges:
+                names = {i.filename for i in infos[start:stop]}
+                subset = {k: v for k, v in expected_md5.items() if k in names}
+                futures[ex.submit(verify_range, zip_path, start, stop, subset)] = stop - start
+            for fut in as_completed(futures):
+                for res in fut.result():
+                    checked += 1
+                    if not res['ok']:
+                        failed.append(res)
+                progress.advance(task, futures[fut])
+
+    return failed, checked
+
+
+def part_size_candidates(size, parts):
+    """
+    Part sizes that cut size bytes into exactly parts parts, so a multipart
+    ETag ('<md5>-<parts>') can be recomputed: common tool defaults, plus the
+    even split rounded up to a MiB.
+    """
+    even = -(-size // parts)
+    candidates = [ps * MIB for ps in COMMON_PART_SIZES] + [-(-even // MIB) * MIB, even]
+    seen = []
+    for ps in candidates:
+        if ps > 0 and -(-size // ps) == parts and ps not in seen:
+            seen.append(ps)
+    return seen
+
+
+def hash_file(path, part_sizes=()):
+    """
+    md5 of a file plus its S3 multipart ETag for each of part_sizes, all in
+    one pass of large readinto() calls into a reused buffer.
+    Returns (md5 hex, {part_size: etag}).
+    """
+    md5 = hashlib.md5()
+    chains = {ps: {'parts': [], 'md5': hashlib.md5(), 'fill': 0} for ps in part_sizes}
+    buf = bytearray(READ_SIZE)
+    view = memoryview(buf)
+    with open(path, 'rb', buffering=0) as fh:
+        while True:
+            n = fh.readinto(buf)
+            if not n:
+                break
+            data = view[:n]
+            md5.update(data)
+            for ps, chain in chains.items():
+                pos = 0
+                while pos < n:
+                    take = min(ps - chain['fill'], n - pos)
+                    chain['md5'].update(data[pos:pos + take])
+                    chain['fill'] += take
+                    pos += take
+                    if chain['fill'] == ps:
+                        chain['parts'].append(chain['md5'].digest())
+                        chain['md5'] = hashlib.md5()
+                        chain['fill'] = 0
+    etags = {}
+    for ps, chain in chains.items():
+        if chain['fill']:
+            chain['parts'].append(chain['md5'].digest())
+        etags[ps] = f"{hashlib.md5(b''.join(chain['parts'])).hexdigest()}-{len(chain['parts'])}"
+    return md5.hexdigest(), etags
+
+
+def check_file(entry):
+    """
+    Compare one local file with its source. entry has path and any of size,
+    md5 (Drive md5Checksum) and etag (S3, single or multipart).
+    """
+    path = entry['path']
+    res = {'path': path, 'source': entry.get('source'), 'size': None, 'md5': None, 'ok': False, 'error': None}
+    try:
+        res['size'] = size = os.path.getsize(path)
+    except OSError:
+        res['error'] = 'missing'
+        return res
+    if entry.get('size') is not None and size != int(entry['size']):
+        res['error'] = f"size {size} != {entry['size']}"
+        return res
+    etag = (entry.get('etag') or '').strip('"')
+    parts = int(etag.rsplit('-', 1)[1]) if '-' in etag else 0
+    sizes = part_size_candidates(size, parts) if parts else []
+    res['md5'], etags = hash_file(path, sizes)
+    if entry.get('md5') and res['md5'] != entry['md5']:
+        res['error'] = f"md5 {res['md5']} != {entry['md5']}"
+    elif parts and etag not in etags.values():
+        res['error'] = f"multipart etag {etag} not matched (tried part sizes {[round(ps / MIB, 2) for ps in sizes]} MiB)"
+    elif etag and not parts and res['md5'] != etag:
+        res['error'] = f"md5 {res['md5']} != etag {etag}"
+    res['ok'] = res['error'] is None
+    return res
+
+
+def verify_files(entries, max_workers=MAX_WORKERS):
+    """
+    Hash and check local files in a process pool, largest first so the
+    pool does not end waiting on one big file. Returns (failed, checked).
+    """
+    from rich.progress import Progress
+
+    def size_of(entry):
+        try:
+            return os.path.getsize(entry['path'])
+        except OSError:
+            return 0
+
+    entries = sorted(entries, key=size_of, reverse=True)
+    failed = []
+    with Progress() as progress:
+        task = progress.add_task("Hashing...", total=sum(map(size_of, entries)) or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as ex:
+            futures = {ex.submit(check_file, e): e for e in entries}
+            for fut in as_completed(futures):
+                res = fut.result()
+                if not res['ok']:
+                    failed.append(dict(res, expected_md5=futures[fut].get('md5'),
+                                       expected_etag=futures[fut].get('etag'),
+                                       expected_size=futures[fut].get('size')))
+                progress.advance(task, res['size'] or 0)
+    return failed, len(entries)
+
+
+def write_report(failed, path):
+    """CSV of mismatches: local path, source, what was expected and what was found."""
+    fields = ['path', 'source', 'error', 'size', 'expected_size', 'md5', 'expected_md5', 'expected_etag']
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.DictWriter(fh, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(sorted(failed, key=lambda r: r['path']))
+    return path
+
+
+def drive_entries(files, root):
+    """Check entries for a download_folder() tree: Drive md5Checksum and size per file."""
+    from drivekit.download import EXPORT_MAP, safe_name, target_name
+
+    entries = []
+    for f in files:
+        if f.get('mimeType') == 'application/vnd.google-apps.folder':
+            continue
+        exported = f.get('mimeType') in EXPORT_MAP   # exports have no md5 or size on Drive
+        entries.append({'path': os.path.join(root, f.get('path', ''), safe_name(target_name(f))),
+                        'source': f['id'],
+                        'md5': None if exported else f.get('md5Checksum'),
+                        'size': None if exported else f.get('size')})
+    return entries
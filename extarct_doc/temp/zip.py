@@ -1,79 +1,19 @@
 import os
-import io
-import zipfile
-import pickle
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from rich.progress import Progress
+import sys
 
-# Google Drive API scope
-SCOPES = ['https://www.googleapis.com/auth/drive']
-
-def authenticate():
-    creds = None
-    if os.path.exists('token.pickle'):
-        with open('token.pickle', 'rb') as token:
-            creds = pickle.load(token)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
-            creds = flow.run_local_server(port=0)
-        with open('token.pickle', 'wb') as token:
-            pickle.dump(creds, token)
-    return creds
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from drivekit import archive
+from drivekit.auth import get_credential_manager
 
-def list_files(service, folder_id):
-    """Recursively list all files inside a folder"""
-    files = []
-    page_token = None
-    while True:
-        response = service.files().list(
-            q=f"'{folder_id}' in parents and trashed=false",
-            spaces='drive',
-            fields='nextPageToken, files(id, name, mimeType)',
-            pageToken=page_token
-        ).execute()
-        for file in response.get('files', []):
-            if file['mimeType'] == 'application/vnd.google-apps.folder':
-                files.extend(list_files(service, file['id']))  # Recursive call
-            else:
-                files.append(file)
-        page_token = response.get('nextPageToken', None)
-        if page_token is None:
-            break
-    return files
-
-def download_and_zip_folder(folder_id, zip_name='drive_folder.zip'):
-    creds = authenticate()
-    service = build('drive', 'v3', credentials=creds)
+SCOPES = ['https://www.googleapis.com/auth/drive']
 
-    print("[+] Fetching file list from Drive...")
-    all_files = list_files(service, folder_id)
-    total_files = len(all_files)
-    print(f"[+] Total files found: {total_files}")
+MAX_WORKERS = 8
 
-    if total_files == 0:
-        print("[-] No files found in this folder.")
-        return
+def authenticate():
+    return get_credential_manager('token.pickle', 'credentials.json', SCOPES)
 
-    with zipfile.ZipFile(zip_name, 'w') as zipf:
-        with Progress() as progress:
-            task = progress.add_task("[green]Downloading...", total=total_files)
-            for file in all_files:
-                request = service.files().get_media(fileId=file['id'])
-                fh = io.BytesIO()
-                downloader = MediaIoBaseDownload(fh, request)
-                done = False
-                while not done:
-                    status, done = downloader.next_chunk()
-                fh.seek(0)
-                zipf.writestr(file['name'], fh.read())
-                progress.advance(task)
-    print(f"\n✅ Folder downloaded and zipped successfully: {zip_name}")
+def download_and_zip_folder(folder_id, zip_name='drive_folder.zip', max_workers=MAX_WORKERS):
+    archive.download_and_zip_folder(authenticate(), folder_id, zip_name, max_workers=max_workers)
 
 if __name__ == '__main__':
     folder_id = input("Enter Google Drive Folder ID: ").strip()
@@ -0,0 +1,15 @@
+# verify_zip.py
+import os
+import sys
+
+import typer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from drivekit.cli import verify
+
+app = typer.Typer()
+app.command()(verify)
+
+
+if __name__ == '__main__':
+    app()
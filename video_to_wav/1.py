@@ -1,130 +1,280 @@
 # gdrive_videos_to_wav.py
 
 import os
+import sys
 import io
-import time
+import shutil
 import tempfile
-import traceback
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 
 import typer
-from rich.progress import Progress
-from moviepy import VideoFileClip
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-import pickle
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from drivekit.auth import get_credential_manager
 
 app = typer.Typer()
 
 SCOPES = ['https://www.googleapis.com/auth/drive']
 
 def authenticate_drive():
-    """Authenticate and return a Google Drive service instance."""
-    creds = None
-    if os.path.exists('token.pickle'):
-        with open('token.pickle', 'rb') as token:
-            creds = pickle.load(token)
-
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(
-                'credentials.json', SCOPES)
-            creds = flow.run_local_server(port=0)
-        with open('token.pickle', 'wb') as token:
-            pickle.dump(creds, token)
-
-    return build('drive', 'v3', credentials=creds)
-
-def list_videos(service, folder_id):
+    """Return the shared credential manager for the Drive token."""
+    return get_credential_manager('token.pickle', 'credentials.json', SCOPES)
+
+def list_videos(auth, folder_id):
     """List all video files in a given Google Drive folder."""
-    query = f"'{folder_id}' in parents and mimeType contains 'video/'"
-    results = []
-    page_token = None
-
-    while True:
-        response = service.files().list(
-            q=query,
-            fields="nextPageToken, files(id, name, mimeType)",
-            pageToken=page_token
-        ).execute()
-        results.extend(response.get('files', []))
-        page_token = response.get('nextPageToken')
-        if not page_token:
-            break
-    return results
-
-def download_file(service, file_id, filename, output_dir):
+    from drivekit.listing import list_files
+    return list_files(auth, folder_id, recursive=False, query="mimeType contains 'video/'")
+
+def download_file(auth, file, output_dir):
     """Download a single file from Google Drive."""
-    request = service.files().get_media(fileId=file_id)
-    file_path = os.path.join(output_dir, filename)
-    with io.FileIO(file_path, 'wb') as f:
-        downloader = MediaIoBaseDownload(f, request)
-        done = False
-        while not done:
-            status, done = downloader.next_chunk()
+    from drivekit.download import fetch, with_retries
+    from drivekit.service import thread_service
+
+    file_path = os.path.join(output_dir, file['name'])
+
+    def attempt():
+        with io.FileIO(file_path, 'wb') as f:
+            fetch(thread_service(auth), file, f)
+
+    with_retries(attempt, auth, file['name'])
     return file_path
 
-def convert_to_wav(video_path, output_dir):
-    """Convert video to WAV using moviepy."""
+def cut_silence(res, silence=None, silence_db=-40.0, min_silence_ms=500):
+    """Optional post-extraction stage: 'trim' or 'split' the WAV on silence."""
+    if not silence:
+        return res
+    from drivekit.audio.silence import split_on_silence
+    res['segments'] = split_on_silence(res['output'], silence, threshold_db=silence_db,
+                                       min_silence_ms=min_silence_ms)
+    res['output'] = res['segments'][0]['output']
+    return res
+
+def encode_parts(res, codec='wav', threads=1):
+    """Re-encode the WAV (or each silence segment) as FLAC/Opus; 'bytes' is the stored size."""
+    from drivekit.audio.ffmpeg import encode_audio
+
+    parts = res.get('segments') or [res]
+    for part in parts:
+        if codec != 'wav':
+            part['output'] = encode_audio(part['output'], codec, threads=threads)
+        part['bytes'] = os.path.getsize(part['output'])
+    res['output'] = parts[0]['output']
+    return res
+
+def finish_audio(res, codec='wav', threads=1, **silence):
+    """Post-extraction stages, run inside the conversion job: silence cut, then encode."""
+    return encode_parts(cut_silence(res, **silence), codec, threads)
+
+def convert_to_wav(video_path, output_dir, backend='ffmpeg', threads=1, sample_rate=None, channels=None,
+                   **post):
+    """
+    Convert video to WAV with ffmpeg (audio stream only) or moviepy.
+    Returns the WAV path and its duration/format/peak/RMS stats; with ffmpeg
+    these are measured while the WAV is written, not by reading it back.
+    post options (silence, codec) are passed to finish_audio().
+    """
     base_name = os.path.splitext(os.path.basename(video_path))[0]
     wav_path = os.path.join(output_dir, f"{base_name}.wav")
+    if backend == 'ffmpeg':
+        from drivekit.audio.ffmpeg import extract_audio
+        stats = extract_audio(video_path, wav_path, sample_rate=sample_rate, channels=channels,
+                              threads=threads, stats=True)
+        return finish_audio({'output': wav_path, 'audio': stats}, threads=threads, **post)
+
+    from moviepy import VideoFileClip
+    from drivekit.audio.wav import wav_stats
+
+    clip = VideoFileClip(video_path)
     try:
-        clip = VideoFileClip(video_path)
-        clip.audio.write_audiofile(wav_path, codec='pcm_s16le')
+        clip.audio.write_audiofile(wav_path, codec='pcm_s16le', fps=sample_rate or 44100,
+                                   nbytes=2, logger=None)
+    finally:
         clip.close()
-    except Exception as e:
-        print(f"[ERROR] {video_path}: {e}")
-    return wav_path
+    return finish_audio({'output': wav_path, 'audio': wav_stats(wav_path)}, threads=threads, **post)
+
+def stream_to_wav(auth, file, output_dir, threads=1, sample_rate=None, channels=None, **post):
+    """
+    Pipe the Drive download straight into ffmpeg and write only the WAV.
+    Falls back to download-then-convert when the container cannot be read
+    from a pipe (MP4/MOV without faststart); other ffmpeg errors, such as a
+    video with no audio stream, are raised without downloading it again.
+    """
+    from drivekit.audio.ffmpeg import FfmpegSink, FfmpegError
+    from drivekit.download import fetch, with_retries, DECODE_CHUNK_SIZE
+    from drivekit.service import thread_service
+
+    base_name = os.path.splitext(os.path.basename(file['name']))[0]
+    wav_path = os.path.join(output_dir, f"{base_name}.wav")
+
+    def attempt():
+        with FfmpegSink(wav_path, sample_rate=sample_rate, channels=channels, threads=threads, stats=True) as sink:
+            fetch(thread_service(auth), file, sink, chunk_size=DECODE_CHUNK_SIZE)
+        return sink.stats
+
+    try:
+        stats = with_retries(attempt, auth, file['name'], no_retry=(FfmpegError,))
+        return finish_audio({'output': wav_path, 'audio': stats}, threads=threads, **post)
+    except FfmpegError as e:
+        if not e.needs_seekable_input:
+            raise
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        video_path = download_file(auth, file, temp_dir)
+        return convert_to_wav(video_path, output_dir, threads=threads, sample_rate=sample_rate, channels=channels,
+                              **post)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
 
 @app.command()
-def main(folder_id: str, output: str = "output_wav", max_workers: int = 4):
+def main(folder_id: str, output: str = "output_wav", max_workers: int = 4,
+         convert_workers: int = typer.Option(0, help="Concurrent conversions (default: one per core)"),
+         queue_size: int = typer.Option(0, help="Downloaded videos allowed to wait for conversion (default 2x convert workers)"),
+         backend: str = typer.Option("ffmpeg", help="ffmpeg (audio stream only) or moviepy"),
+         threads_per_job: int = typer.Option(1, help="ffmpeg -threads for each conversion"),
+         sample_rate: int = typer.Option(0, help="Resample to this rate (default: keep source)"),
+         channels: int = typer.Option(0, help="Down/up-mix to this many channels (default: keep source)"),
+         stream: bool = typer.Option(False, help="Pipe downloads straight into ffmpeg; only WAVs touch the disk"),
+         ledger: str = typer.Option(None, help="Conversion ledger (default: <output>/.conversions.sqlite)"),
+         force: bool = typer.Option(False, help="Ignore the ledger and convert everything again"),
+         shards: str = typer.Option(None, help="Pack WAVs into tar shards in this directory instead of loose files"),
+         shard_size: int = typer.Option(1024, help="Shard size in MB"),
+         manifest_format: str = typer.Option("csv", help="Audio stats manifest: csv or parquet"),
+         silence: str = typer.Option(None, help="Cut silence after extraction: trim or split"),
+         silence_db: float = typer.Option(-40.0, help="Frames below this level (dBFS) are silence"),
+         min_silence_ms: int = typer.Option(500, help="Shortest pause that splits a segment"),
+         codec: str = typer.Option("wav", help="Stored format: wav, flac (lossless) or opus (previews)"),
+         root: str = typer.Option(None, help="Read FOLDER_ID as a path (A000053/sub) below this folder ID")):
     """
     Download all videos from a Google Drive folder (using folder ID)
     and convert them to WAV files.
+
+    Downloads run in max_workers threads and feed a bounded queue; conversion
+    runs in a separate process pool so CPU-bound decoding does not hold the GIL
+    while the network idles. With the ffmpeg backend the conversions are
+    ffmpeg subprocesses run side by side, threads_per_job threads each.
+
+    --stream skips the temp video entirely: each Drive download is piped into
+    its own ffmpeg process, which starts decoding on the first chunk.
+
+    Every outcome is written to a ledger keyed by Drive id + modifiedTime, so
+    re-running the same command only converts new, changed or failed videos.
+
+    With --shards every WAV is moved into WebDataset-style tar shards
+    (shard-000000.tar, ...) next to a <key>.json with its Drive metadata, and
+    shards.json lists the shards, so training jobs read a few large files.
+
+    Duration, sample rate, channels, peak and RMS of every WAV are measured
+    during conversion and appended to <output>/audio_manifest.csv
+    (also written as .parquet with --manifest-format parquet).
+
+    --silence trim drops leading/trailing silence; --silence split replaces
+    each WAV with <name>_000.wav, <name>_001.wav, ... one per non-silent
+    stretch. Each segment gets a manifest row with its start/end offsets
+    (seconds into the extracted audio). Detection streams the WAV in blocks,
+    so memory stays flat however long the recording is.
+
+    --codec flac (or opus) re-encodes every WAV/segment as its last step,
+    inside the same per-core conversion jobs, and only the encoded file is
+    kept; the manifest's bytes column has the stored size.
     """
+    # imported here so `--help` does not pay for rich/googleapiclient/moviepy
+    from drivekit.audio.ffmpeg import default_jobs
+    from drivekit.cli import _folder
+    from drivekit.audio.manifest import AudioManifest, csv_to_parquet
+    from drivekit.ledger import ConversionLedger, file_md5
+    from drivekit.shards import ShardWriter, sample_key
+    from drivekit.pipeline import run_two_stage, run_streaming
+
+    if backend not in ('ffmpeg', 'moviepy'):
+        raise typer.BadParameter("backend must be 'ffmpeg' or 'moviepy'")
+    if stream and backend != 'ffmpeg':
+        raise typer.BadParameter("--stream needs the ffmpeg backend")
+    if silence not in (None, 'trim', 'split'):
+        raise typer.BadParameter("silence must be 'trim' or 'split'")
+    if codec not in ('wav', 'flac', 'opus'):
+        raise typer.BadParameter("codec must be 'wav', 'flac' or 'opus'")
+    if backend == 'ffmpeg':
+        convert_workers = convert_workers or default_jobs(threads_per_job)
+    else:
+        convert_workers = convert_workers or os.cpu_count() or 4
+
     os.makedirs(output, exist_ok=True)
-    temp_dir = tempfile.mkdtemp()
 
     typer.echo(f"🔐 Authenticating Google Drive...")
-    service = authenticate_drive()
+    auth = authenticate_drive()
+    folder_id = _folder(auth, folder_id, root)
 
     typer.echo(f"📂 Listing videos in folder: {folder_id}")
-    videos = list_videos(service, folder_id)
+    videos = list_videos(auth, folder_id)
     typer.echo(f"🎞️ Found {len(videos)} videos")
 
     if not videos:
         typer.echo("No videos found in this folder.")
         return
 
-    with Progress() as progress:
-        task = progress.add_task("[cyan]Downloading and converting videos...", total=len(videos))
+    book = ConversionLedger(ledger or os.path.join(output, '.conversions.sqlite'))
+    if not force:
+        total = len(videos)
+        videos = book.pending(videos)
+        typer.echo(f"⏭️ {total - len(videos)} already converted, {len(videos)} to do")
+        if not videos:
+            return
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = []
-            for v in videos:
-                futures.append(executor.submit(process_video, service, v, temp_dir, output, progress, task))
+    writer = ShardWriter(shards, max_size=shard_size * 1024 * 1024) if shards else None
+    manifest = AudioManifest(os.path.join(output, 'audio_manifest.csv'))
 
-            for future in as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    typer.echo(f"Error: {e}")
+    def record(item, res):
+        md5 = None
+        if res['success']:
+            parts = res.get('segments') or [{'output': res['output'], 'bytes': res.get('bytes'), **res['audio']}]
+            for part in parts:
+                if writer:
+                    audio = part['output']
+                    md5 = md5 or file_md5(audio)
+                    meta = {k: item.get(k) for k in ('id', 'name', 'mimeType', 'modifiedTime', 'md5Checksum', 'size')}
+                    meta['audio'] = {k: v for k, v in part.items() if k != 'output'}
+                    part['output'] = writer.write(sample_key(audio), {codec: audio}, meta)
+                    os.remove(audio)
+                manifest.add({'file_id': item['id'], 'name': item['name'], **part})
+            res['output'] = parts[0]['output']
+        book.record(item, res['output'], res['error'], md5=md5)
 
-    typer.echo(f"✅ Conversion complete. WAV files saved in: {output}")
+    post = {'silence': silence, 'silence_db': silence_db, 'min_silence_ms': min_silence_ms, 'codec': codec}
+    if stream:
+        results = run_streaming(
+            videos,
+            partial(stream_to_wav, auth, output_dir=output, threads=threads_per_job,
+                    sample_rate=sample_rate or None, channels=channels or None, **post),
+            workers=max(max_workers, convert_workers),
+            on_result=record,
+        )
+    else:
+        temp_dir = tempfile.mkdtemp()
+        results = run_two_stage(
+            videos,
+            fetch=partial(download_file, auth, output_dir=temp_dir),
+            convert=partial(convert_to_wav, output_dir=output, backend=backend, threads=threads_per_job,
+                            sample_rate=sample_rate or None, channels=channels or None, **post),
+            download_workers=max_workers,
+            convert_workers=convert_workers,
+            queue_size=queue_size or None,
+            convert_executor='thread' if backend == 'ffmpeg' else 'process',
+            on_result=record,
+        )
+        shutil.rmtree(temp_dir, ignore_errors=True)
 
-def process_video(service, file, temp_dir, output_dir, progress, task):
-    """Download and convert a single video."""
-    try:
-        file_path = download_file(service, file['id'], file['name'], temp_dir)
-        convert_to_wav(file_path, output_dir)
-    except Exception as e:
-        print(f"Error processing {file['name']}: {e}")
-    finally:
-        progress.update(task, advance=1)
+    book.close()
+    manifest.close()
+    if writer:
+        writer.close()
+    if manifest_format == 'parquet':
+        typer.echo(f"📊 Manifest: {csv_to_parquet(manifest.path)}")
+
+    failed = [r for r in results if not r['success']]
+    for r in failed:
+        typer.echo(f"Error processing {r['name']}: {r['error']}")
+    typer.echo(f"✅ Conversion complete. {len(results) - len(failed)} {codec.upper()} files saved in: {shards or output}")
 
 if __name__ == "__main__":
     app()